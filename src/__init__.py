@@ -8,17 +8,19 @@ plugin API.
 
 import logging
 import os
-import time
 
 from .config import (
     PLUGIN_CONFIG, PLUGIN_FIELDS,
-    REDIS_KEY_RUNNING, REDIS_KEY_HOST, REDIS_KEY_PORT, REDIS_KEY_STOP,
+    REDIS_KEY_RUNNING, REDIS_KEY_HOST, REDIS_KEY_PORT, REDIS_KEY_STOP, REDIS_KEY_STOPPED_ACK,
+    REDIS_KEY_LEADER, REDIS_KEY_MANUAL_STOP, REDIS_KEY_OWNER, STOP_CONFIRM_TIMEOUT,
     DEFAULT_PORT, DEFAULT_HOST,
 )
 from .collector import PrometheusMetricsCollector
 from .server import MetricsServer, get_current_server
 from .autostart import attempt_autostart
-from .utils import get_redis_client, read_redis_flag, normalize_host, redis_decode
+from .utils import (
+    get_redis_client, is_redis_flag, read_redis_flag, normalize_host, redis_decode, request_server_stop,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -100,32 +102,51 @@ class Plugin:
         except Exception as e:
             logger.debug(f"Could not check for root-owned __pycache__: {e}")
 
-    def _get_redis_server_state(self):
-        """Return (redis_client, server_running, server_host, server_port)."""
-        redis_client = get_redis_client()
+    def _get_redis_server_state(self, redis_client):
+        """Return (server_running, server_host, server_port) as recorded in Redis."""
         server_running = False
         server_host = None
         server_port = None
 
         try:
             if redis_client:
-                server_running = read_redis_flag(redis_client, REDIS_KEY_RUNNING)
+                running, host, port = redis_client.mget(REDIS_KEY_RUNNING, REDIS_KEY_HOST, REDIS_KEY_PORT)
+                server_running = is_redis_flag(running)
                 if server_running:
-                    server_host = redis_decode(redis_client.get(REDIS_KEY_HOST)) or DEFAULT_HOST
-                    server_port = redis_decode(redis_client.get(REDIS_KEY_PORT)) or str(DEFAULT_PORT)
+                    server_host = redis_decode(host) or DEFAULT_HOST
+                    server_port = redis_decode(port) or str(DEFAULT_PORT)
         except Exception as e:
             logger.debug(f"Could not read Redis server state: {e}")
 
-        return redis_client, server_running, server_host, server_port
+        return server_running, server_host, server_port
+
+    @staticmethod
+    def _stop_remote_server(redis_client, timeout: int = STOP_CONFIRM_TIMEOUT) -> bool:
+        """Signal the server in any worker to stop and wait for it to confirm.
+
+        The stop request checks the running flag and signals the server in
+        one atomic script call.  The server pushes to REDIS_KEY_STOPPED_ACK
+        once its Redis keys are cleared, so a single BLPOP replaces polling
+        the running flag.  A final read of the flag covers servers that do
+        not send the ack.
+        """
+        if not request_server_stop(redis_client):
+            return True
+        try:
+            if redis_client.blpop(REDIS_KEY_STOPPED_ACK, timeout=timeout):
+                return True
+        except Exception as e:
+            logger.debug(f"Waiting for stop acknowledgement failed: {e}")
+        return not read_redis_flag(redis_client, REDIS_KEY_RUNNING)
 
     # ── Action dispatcher ────────────────────────────────────────────────────
 
     def run(self, action: str, params: dict, context: dict):
         """Execute a plugin action and return a result dict."""
         logger_ctx = context.get("logger", logger)
-        settings   = context.get("settings", {})
+        settings   = context.get("settings") or {}
 
-        redis_client, server_running_redis, server_host, server_port = self._get_redis_server_state()
+        redis_client = get_redis_client()
         current_server = get_current_server()
 
         # ── restart_server (also serves as start) ────────────────────────────
@@ -134,46 +155,48 @@ class Plugin:
                 # Clear manual-stop flag so this explicit start is honored
                 if redis_client:
                     try:
-                        from .config import REDIS_KEY_MANUAL_STOP
                         redis_client.delete(REDIS_KEY_MANUAL_STOP)
                     except Exception:
                         pass
 
+                # A server in this process is stopped directly: stop() joins
+                # its thread, which clears the Redis keys on the way out, so
+                # Redis is only needed to reach a server in another worker.
+                stopped_locally = False
                 if current_server and current_server.is_running():
-                    current_server.stop()
+                    stopped_locally = current_server.stop()
 
-                if redis_client:
+                if redis_client and not stopped_locally:
                     try:
-                        redis_client.set(REDIS_KEY_STOP, "1")
-                        stopped = False
-                        for _ in range(50):
-                            if not read_redis_flag(redis_client, REDIS_KEY_RUNNING):
-                                stopped = True
-                                break
-                            time.sleep(0.1)
-                        if not stopped:
-                            logger_ctx.warning("Server did not confirm shutdown within 5s during restart, force-cleaning")
-                            redis_client.delete(REDIS_KEY_RUNNING, REDIS_KEY_HOST, REDIS_KEY_PORT, REDIS_KEY_STOP)
+                        if not self._stop_remote_server(redis_client):
+                            logger_ctx.warning(
+                                f"Server did not confirm shutdown within {STOP_CONFIRM_TIMEOUT}s during restart, force-cleaning"
+                            )
+                            redis_client.delete(REDIS_KEY_RUNNING, REDIS_KEY_HOST, REDIS_KEY_PORT, REDIS_KEY_OWNER, REDIS_KEY_STOP)
                     except Exception as e:
                         return {"status": "error", "message": f"Failed to stop server: {str(e)}"}
 
-                time.sleep(0.5)
-
-                if redis_client:
+                # Any stop above was confirmed (or force-cleaned) before
+                # returning, so there is nothing to wait for here.  Clear the
+                # stop flag and re-check the running flag in one round trip;
+                # MULTI/EXEC so no other action can act in between.
+                still_running = False
+                if redis_client and not stopped_locally:
                     try:
-                        redis_client.delete(REDIS_KEY_STOP)
+                        pipe = redis_client.pipeline(transaction=True)
+                        pipe.delete(REDIS_KEY_STOP)
+                        pipe.get(REDIS_KEY_RUNNING)
+                        still_running = is_redis_flag(pipe.execute()[1])
                     except Exception:
                         pass
 
-                time.sleep(0.5)
-
                 port = int(settings.get("port", DEFAULT_PORT))
                 host = normalize_host(
                     settings.get("host", DEFAULT_HOST),
                     DEFAULT_HOST,
                 )
 
-                if redis_client and read_redis_flag(redis_client, REDIS_KEY_RUNNING):
+                if still_running:
                     return {"status": "error", "message": "Server is still running after stop attempt"}
 
                 server = MetricsServer(self.collector, port=port, host=host)
@@ -200,7 +223,6 @@ class Plugin:
                 # The flag is cleared on fresh Dispatcharr boot (CLEANUP_REDIS_KEYS).
                 if redis_client:
                     try:
-                        from .config import REDIS_KEY_MANUAL_STOP
                         redis_client.set(REDIS_KEY_MANUAL_STOP, "1")
                     except Exception:
                         pass
@@ -212,16 +234,14 @@ class Plugin:
                 if redis_client:
                     try:
                         logger_ctx.info("Sending stop signal via Redis")
-                        redis_client.set(REDIS_KEY_STOP, "1")
-
-                        for _ in range(50):  # wait up to 5 s
-                            if not read_redis_flag(redis_client, REDIS_KEY_RUNNING):
-                                logger_ctx.info("Server confirmed shutdown via Redis")
-                                return {"status": "success", "message": "Metrics server stopped successfully"}
-                            time.sleep(0.1)
-
-                        logger_ctx.warning("Server did not confirm shutdown within 5s, force-cleaning Redis keys")
-                        redis_client.delete(REDIS_KEY_RUNNING, REDIS_KEY_HOST, REDIS_KEY_PORT, REDIS_KEY_STOP)
+                        if self._stop_remote_server(redis_client):
+                            logger_ctx.info("Server confirmed shutdown via Redis")
+                            return {"status": "success", "message": "Metrics server stopped successfully"}
+
+                        logger_ctx.warning(
+                            f"Server did not confirm shutdown within {STOP_CONFIRM_TIMEOUT}s, force-cleaning Redis keys"
+                        )
+                        redis_client.delete(REDIS_KEY_RUNNING, REDIS_KEY_HOST, REDIS_KEY_PORT, REDIS_KEY_OWNER, REDIS_KEY_STOP)
                         return {
                             "status": "warning",
                             "message": "Stop signal sent but server did not confirm. Redis keys cleared.",
@@ -238,18 +258,15 @@ class Plugin:
         # ── server_status ────────────────────────────────────────────────────
         elif action == "server_status":
             try:
-                if server_running_redis and server_host and server_port:
-                    endpoint = f"http://{server_host}:{server_port}/metrics"
-                elif current_server and current_server.host and current_server.port:
-                    endpoint = f"http://{current_server.host}:{current_server.port}/metrics"
+                # A server in this process is authoritative; Redis is only
+                # read to find one running in another worker.
+                if current_server and current_server.is_running():
+                    host, port = current_server.host, current_server.port
                 else:
-                    host = settings.get("host", DEFAULT_HOST) if settings else DEFAULT_HOST
-                    port = settings.get("port", DEFAULT_PORT) if settings else DEFAULT_PORT
-                    endpoint = f"http://{host}:{port}/metrics"
-
-                if (current_server and current_server.is_running()) or server_running_redis:
-                    return {"status": "success", "message": f"Server is running on {endpoint}"}
-                return {"status": "success", "message": "Server is not running"}
+                    server_running_redis, host, port = self._get_redis_server_state(redis_client)
+                    if not server_running_redis:
+                        return {"status": "success", "message": "Server is not running"}
+                return {"status": "success", "message": "Server is running on http://%s:%s/metrics" % (host, port)}
 
             except Exception as e:
                 logger_ctx.error(f"Error checking server status: {e}", exc_info=True)
@@ -266,23 +283,23 @@ class Plugin:
         direct reference.  We fall back to Redis signaling so the old
         server's monitor loop detects the stop flag and exits.
         """
+        redis_client = get_redis_client()
         current_server = get_current_server()
         if current_server and current_server.is_running():
             logger.info("Plugin stopping, shutting down metrics server")
             current_server.stop()
-        else:
-            # Redis fallback: signal orphaned server from a previous module load
-            redis_client = get_redis_client()
-            if redis_client and read_redis_flag(redis_client, REDIS_KEY_RUNNING):
-                logger.info("Plugin stopping, sending Redis stop signal to orphaned metrics server")
-                redis_client.set(REDIS_KEY_STOP, "1")
-
-        # Clear leader election and dedup keys so the next discovery can re-autostart
+        elif redis_client:
+            # Redis fallback: signal an orphaned server from a previous module load
+            try:
+                if request_server_stop(redis_client):
+                    logger.info("Plugin stopping, sent Redis stop signal to orphaned metrics server")
+            except Exception as e:
+                logger.debug(f"Could not send Redis stop signal: {e}")
+
+        # Clear the leader election key so the next discovery can re-autostart
         try:
-            rc = get_redis_client()
-            if rc:
-                from .config import REDIS_KEY_LEADER
-                rc.delete(REDIS_KEY_LEADER, REDIS_KEY_LEADER + ":autostart_dedup")
+            if redis_client:
+                redis_client.delete(REDIS_KEY_LEADER)
         except Exception:
             pass
 
@@ -5,8 +5,9 @@ Replaces the old file-lock (flock / /tmp) mechanism with Redis leader election:
   1. Each uWSGI worker calls ``attempt_autostart()`` from ``Plugin.__init__``.
      A per-process guard ensures only one thread is spawned per process.
 
-  2. The background thread waits for the Django ORM to be ready, then reads
-     the plugin config.  If ``auto_start`` is disabled it exits immediately.
+  2. The background thread reads the plugin config straight away, retrying
+     until the Django ORM is ready.  If ``auto_start`` is disabled it exits
+     without touching Redis.
 
   3. It races all other workers with a Redis ``SET NX EX`` on a leader key.
      Only the winner proceeds; all others exit cleanly.
@@ -28,15 +29,27 @@ import os
 import threading
 import time
 
+from .config import (
+    CLEANUP_REDIS_KEYS, REDIS_KEY_LEADER, REDIS_KEY_RUNNING, REDIS_KEY_MANUAL_STOP,
+    LEADER_TTL, DEFAULT_PORT, DEFAULT_HOST, AUTO_START_DEFAULT, PLUGIN_DB_KEY,
+)
+from .server import MetricsServer
+from .utils import get_redis_client, normalize_host, reset_redis_client
+
+try:
+    from apps.plugins.models import PluginConfig
+except ImportError:  # reported by the config-read loop in _autostart_worker
+    PluginConfig = None
+
 logger = logging.getLogger(__name__)
 
 # Per-process guard: only one autostart thread may be spawned per process.
 _autostart_launched = False
 _autostart_lock = threading.Lock()
 
-_STARTUP_WAIT = 5   # seconds before the first config-read attempt
-_RETRY_DELAY  = 3   # seconds between subsequent attempts
-_MAX_ATTEMPTS = 8   # total attempts to read PluginConfig from the DB
+_STARTUP_WAIT = 5     # max seconds to wait for Redis once auto-start is enabled
+_RETRY_DELAY  = 0.5   # seconds between readiness checks (ORM and Redis)
+_MAX_ATTEMPTS = 58    # total attempts to read PluginConfig from the DB (~29s)
 
 
 def attempt_autostart(collector) -> None:
@@ -52,7 +65,7 @@ def attempt_autostart(collector) -> None:
             return
         _autostart_launched = True
 
-    # Redis-level dedup is handled later inside the background thread
+    # Cross-process dedup is handled later inside the background thread
     # (leader election). We avoid touching Redis here because Plugin.__init__
     # runs at import time, potentially before Dispatcharr's Redis is ready.
     # Blocking here would stall the entire uWSGI worker boot.
@@ -71,7 +84,6 @@ def cleanup_stale_state(redis_client) -> None:
     The leader key is intentionally *not* deleted here so the winning worker
     retains its claim throughout the startup sequence.
     """
-    from .config import CLEANUP_REDIS_KEYS
     try:
         if redis_client:
             deleted = redis_client.delete(*CLEANUP_REDIS_KEYS)
@@ -83,33 +95,29 @@ def cleanup_stale_state(redis_client) -> None:
         logger.warning(f"Startup cleanup failed: {e}")
 
 
+def _wait_for_redis(timeout: float):
+    """Return the Redis client once it answers PING, or None after *timeout* seconds."""
+    deadline = time.monotonic() + timeout
+    while True:
+        redis_client = get_redis_client()
+        if redis_client is not None:
+            try:
+                redis_client.ping()
+                return redis_client
+            except Exception:
+                reset_redis_client()
+        if time.monotonic() >= deadline:
+            return None
+        time.sleep(_RETRY_DELAY)
+
+
 def _autostart_worker(collector) -> None:
     """Background thread body."""
-    from .config import REDIS_KEY_LEADER, REDIS_KEY_RUNNING, LEADER_TTL, DEFAULT_PORT, DEFAULT_HOST, AUTO_START_DEFAULT, PLUGIN_DB_KEY
-    from .utils import get_redis_client, normalize_host
-
-    # ── Step 0: Redis dedup (prevents redundant threads after force_reload) ──
-    # This runs inside the thread (after the daemon is spawned) so it never
-    # blocks uWSGI worker boot.  The initial sleep gives Redis time to be ready.
-    time.sleep(_STARTUP_WAIT)
-    try:
-        _rc = get_redis_client()
-        if _rc:
-            _dedup_key = REDIS_KEY_LEADER + ":autostart_dedup"
-            if not _rc.set(_dedup_key, "1", nx=True, ex=(_RETRY_DELAY * _MAX_ATTEMPTS) + 30):
-                # Key exists — but if nothing is actually running or leading,
-                # it's stale from a previous lifecycle.  Clear and proceed.
-                if not _rc.get(REDIS_KEY_RUNNING) and not _rc.get(REDIS_KEY_LEADER):
-                    logger.debug("Prometheus exporter: stale autostart_dedup key, clearing")
-                    _rc.delete(_dedup_key)
-                    _rc.set(_dedup_key, "1", nx=True, ex=(_RETRY_DELAY * _MAX_ATTEMPTS) + 30)
-                else:
-                    logger.debug("Prometheus exporter: auto-start already in progress (Redis dedup), skipping")
-                    return
-    except Exception:
-        pass  # Redis not available yet — proceed, leader election will gate us
-
-    # ── Step 1: wait for Django ORM and read plugin config ───────────────────
+    # ── Step 1: read plugin config ───────────────────────────────────────────
+    # Done before touching Redis so that, when auto-start is disabled (or the
+    # plugin is), the thread exits after a single query instead of sleeping
+    # for nothing.  Retries cover the ORM not being ready yet; the first
+    # attempt is immediate.
     # Try both key forms since Dispatcharr derives the DB key from the zip
     # folder name, which may use underscores or hyphens depending on build source.
     _plugin_keys = [PLUGIN_DB_KEY, PLUGIN_DB_KEY.replace('_', '-')]
@@ -118,16 +126,12 @@ def _autostart_worker(collector) -> None:
     auto_start_enabled = False
 
     for attempt in range(_MAX_ATTEMPTS):
-        # First iteration has no sleep — _STARTUP_WAIT already elapsed above.
         if attempt > 0:
             time.sleep(_RETRY_DELAY)
         try:
-            from apps.plugins.models import PluginConfig
-            config = None
-            for _key in _plugin_keys:
-                config = PluginConfig.objects.filter(key=_key).first()
-                if config is not None:
-                    break
+            # One query for both key forms, preferring the underscore one
+            configs = {c.key: c for c in PluginConfig.objects.filter(key__in=_plugin_keys)}
+            config = next((configs[k] for k in _plugin_keys if k in configs), None)
             if config is None:
                 logger.debug(
                     f"Prometheus exporter: PluginConfig not found yet "
@@ -158,28 +162,30 @@ def _autostart_worker(collector) -> None:
         logger.debug("Prometheus exporter: auto-start disabled in settings")
         return
 
-    # ── Step 1b: respect manual stop ─────────────────────────────────────────
-    # If the user manually stopped the server during this Dispatcharr runtime,
-    # a Redis flag is set.  It's cleared on fresh boot (CLEANUP_REDIS_KEYS).
-    try:
-        from .config import REDIS_KEY_MANUAL_STOP
-        _rc = get_redis_client()
-        if _rc and _rc.get(REDIS_KEY_MANUAL_STOP):
-            logger.debug("Prometheus exporter: auto-start skipped (server was manually stopped)")
-            return
-    except Exception:
-        pass
-
     # ── Step 2: leader election via Redis SET NX ─────────────────────────────
-    redis_client = get_redis_client()
+    # Proceeds as soon as Redis answers instead of after a fixed delay.
+    redis_client = _wait_for_redis(_STARTUP_WAIT)
     if redis_client is None:
         logger.warning("Prometheus exporter: cannot connect to Redis, aborting auto-start")
         return
 
-    # Guard: if the server is already running (e.g. we were force-reloaded
-    # and the old daemon thread is still alive), skip everything.  This
-    # prevents cleanup_stale_state from nuking keys for a live server.
-    if redis_client.get(REDIS_KEY_RUNNING):
+    # Both guards are read in one round trip:
+    #  - manual stop: the user stopped the server during this Dispatcharr
+    #    runtime (cleared on fresh boot via CLEANUP_REDIS_KEYS).
+    #  - running: the server is already up (e.g. we were force-reloaded and
+    #    the old daemon thread is still alive).  Skipping here prevents
+    #    cleanup_stale_state from nuking keys for a live server.
+    # Workers that get past them are serialised by the leader key alone: one
+    # atomic SET NX EX, whose TTL also frees the claim if the winner dies.
+    try:
+        manual_stop, running = redis_client.mget(REDIS_KEY_MANUAL_STOP, REDIS_KEY_RUNNING)
+    except Exception as e:
+        logger.warning(f"Prometheus exporter: could not read Redis state, aborting auto-start: {e}")
+        return
+    if manual_stop:
+        logger.debug("Prometheus exporter: auto-start skipped (server was manually stopped)")
+        return
+    if running:
         logger.debug("Prometheus exporter: server already running (Redis), skipping auto-start")
         return
 
@@ -202,7 +208,6 @@ def _autostart_worker(collector) -> None:
         DEFAULT_HOST,
     )
 
-    from .server import MetricsServer
     server = MetricsServer(collector, port=port, host=host)
     if server.start(settings=settings_dict):
         logger.info(
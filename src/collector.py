@@ -4,8 +4,21 @@ Queries Dispatcharr's Django models and Redis state on every scrape request
 and returns the complete metrics output in Prometheus text format.
 """
 
+import io
 import logging
+import re
 import time
+from datetime import datetime, timedelta, timezone
+
+from django.core.exceptions import AppRegistryNotReady
+from django.db.models import Count, Q
+from django.utils import timezone as django_timezone
+
+try:
+    import gevent
+    from gevent import monkey
+except ImportError:  # snapshots are then read sequentially
+    gevent = None
 
 try:
     from apps.proxy.live_proxy.constants import ChannelMetadataField
@@ -15,280 +28,761 @@ except ImportError:
     _CHANNEL_KEY_PREFIX = "ts_proxy"
 
 from .config import PLUGIN_CONFIG, PLUGIN_FIELDS, DEFAULT_PORT
-from .utils import escape_label, get_dispatcharr_version
+from .utils import escape_label, get_dispatcharr_version, get_decoded_redis_client, get_redis_client
 
 logger = logging.getLogger(__name__)
 
+# Metadata field names, resolved once so the per-stream loop does a plain
+# global lookup instead of a class attribute lookup.
+_F_STREAM_ID = ChannelMetadataField.STREAM_ID
+_F_M3U_PROFILE = ChannelMetadataField.M3U_PROFILE
+_F_INIT_TIME = ChannelMetadataField.INIT_TIME
+_F_STREAM_PROFILE = ChannelMetadataField.STREAM_PROFILE
+_F_VIDEO_CODEC = ChannelMetadataField.VIDEO_CODEC
+_F_RESOLUTION = ChannelMetadataField.RESOLUTION
+_F_SOURCE_FPS = ChannelMetadataField.SOURCE_FPS
+_F_VIDEO_BITRATE = ChannelMetadataField.VIDEO_BITRATE
+_F_FFMPEG_OUTPUT_BITRATE = ChannelMetadataField.FFMPEG_OUTPUT_BITRATE
+_F_FFMPEG_SPEED = ChannelMetadataField.FFMPEG_SPEED
+_F_TOTAL_BYTES = ChannelMetadataField.TOTAL_BYTES
+_F_STATE = ChannelMetadataField.STATE
+
+# How long small reference tables (profiles, group counts) are reused
+# between scrapes before being re-read from the database.
+_REFERENCE_CACHE_TTL = 30  # seconds
+
+# Live channel metadata fields read by the stream collector.  Fetched with
+# HMGET so the rest of the (much wider) metadata hash never leaves Redis.
+_STREAM_META_FIELDS = (
+    _F_STREAM_ID,
+    _F_M3U_PROFILE,
+    _F_INIT_TIME,
+    _F_STREAM_PROFILE,
+    _F_VIDEO_CODEC,
+    _F_RESOLUTION,
+    _F_SOURCE_FPS,
+    _F_VIDEO_BITRATE,
+    _F_FFMPEG_OUTPUT_BITRATE,
+    _F_FFMPEG_SPEED,
+    _F_TOTAL_BYTES,
+    _F_STATE,
+)
+
+# Client hash fields read by the client collector, fetched with HMGET.
+_CLIENT_FIELDS = (
+    'ip_address',
+    'user_agent',
+    'worker_id',
+    'user_id',
+    'connected_at',
+    'bytes_sent',
+    'avg_rate_KBps',
+    'current_rate_KBps',
+)
+
+# Status choices and the M3U / EPG source aggregate expressions are fixed
+# for the life of the process, so _import_models() builds them once instead
+# of on every scrape.
+_M3U_STATUS_VALUES = ()
+_EPG_STATUS_VALUES = ()
+_M3U_ACCOUNT_AGGREGATES = {}
+_EPG_SOURCE_AGGREGATES = {}
+
+
+def _status_aggregates(status_values) -> dict:
+    """Return the total / active / per-status Count aggregates for a source model."""
+    return {
+        'total': Count('id'),
+        'active': Count('id', filter=Q(is_active=True)),
+        **{
+            f"status_{i}": Count('id', filter=Q(status=status_value))
+            for i, status_value in enumerate(status_values)
+        },
+    }
+
+
+# Dispatcharr models, bound by _import_models().  None until Django's app
+# registry is ready; the VOD models stay None on builds without VOD support.
+User = Channel = ChannelGroup = ChannelStream = Stream = None
+EPGSource = ProgramData = M3UAccount = M3UAccountProfile = StreamProfile = None
+Episode = M3UMovieRelation = M3USeriesRelation = Movie = None
+
+
+def _import_models() -> bool:
+    """Bind the Dispatcharr models above; False if the app registry is not ready yet."""
+    global User, Channel, ChannelGroup, ChannelStream, Stream
+    global EPGSource, ProgramData, M3UAccount, M3UAccountProfile, StreamProfile
+    global Episode, M3UMovieRelation, M3USeriesRelation, Movie
+    global _M3U_STATUS_VALUES, _EPG_STATUS_VALUES, _M3U_ACCOUNT_AGGREGATES, _EPG_SOURCE_AGGREGATES
+    try:
+        from apps.accounts.models import User
+        from apps.channels.models import Channel, ChannelGroup, ChannelStream, Stream
+        from apps.epg.models import EPGSource, ProgramData
+        from apps.m3u.models import M3UAccount, M3UAccountProfile
+        from core.models import StreamProfile
+    except AppRegistryNotReady:  # plugin imported before Django setup
+        return False
+    _M3U_STATUS_VALUES = tuple(choice[0] for choice in M3UAccount.Status.choices)
+    _EPG_STATUS_VALUES = tuple(choice[0] for choice in EPGSource.STATUS_CHOICES)
+    _M3U_ACCOUNT_AGGREGATES = _status_aggregates(_M3U_STATUS_VALUES)
+    _EPG_SOURCE_AGGREGATES = _status_aggregates(_EPG_STATUS_VALUES)
+    try:
+        from apps.vod.models import Episode, M3UMovieRelation, M3USeriesRelation, Movie
+    except (ImportError, AppRegistryNotReady):  # Dispatcharr builds without VOD support
+        pass
+    return True
+
+
+_import_models()
+
+# SCAN batch size; large enough to walk the keyspace in a few cursor round-trips.
+_SCAN_COUNT = 1000
+
+# User agents are flattened to one line and label-escaped in a single pass
+_USER_AGENT_ESCAPES = str.maketrans({'\\': '\\\\', '"': '\\"', '\n': ' ', '\r': None})
+
+# Trailing " (YYYY)" on a series name, stripped before matching episode titles
+_YEAR_SUFFIX_RE = re.compile(r'\s*\(\d{4}\)$')
+
+# Per-stream metadata lines carry a dozen labels; formatting them from one
+# template avoids building and joining a list of label strings per stream.
+_LIVE_METADATA_TEMPLATE = (
+    'dispatcharr_stream_metadata{{{base_labels},'
+    'channel_name="{channel_name}",channel_group="{channel_group}",'
+    'stream_id="{stream_id}",stream_name="{stream_name}",'
+    'provider="{provider}",provider_type="{provider_type}",state="{state}",'
+    'logo_url="{logo_url}",profile_id="{profile_id}",profile_name="{profile_name}",'
+    'stream_profile="{stream_profile}",video_codec="{video_codec}",resolution="{resolution}"}} 1\n'
+)
+_VOD_METADATA_TEMPLATE = (
+    'dispatcharr_stream_metadata{{{base_labels},'
+    'content_uuid="{content_uuid}",channel_name="{channel_name}",channel_group="{channel_group}",'
+    'content_type="{content_type}",provider="{provider}",provider_type="{provider_type}",state="active",'
+    'logo_url="{logo_url}",profile_id="{profile_id}",profile_name="{profile_name}",'
+    'stream_profile="{stream_profile}",video_codec="{video_codec}",resolution="{resolution}"'
+    '{episode_labels}}} 1\n'
+)
+
+
+def _header(name: str, help_text: str, metric_type: str = 'gauge') -> str:
+    """Return the ``# HELP`` / ``# TYPE`` lines for one metric family."""
+    return f"# HELP {name} {help_text}\n# TYPE {name} {metric_type}\n"
+
+
+# The plugin version is fixed for the life of the process
+_EXPORTER_INFO_LINE = f'dispatcharr_exporter_info{{version="{PLUGIN_CONFIG["version"].lstrip("-")}"}} 1\n'
+
+# HELP/TYPE blocks never change, so each section's headers are built once
+# at import and written with a single call per scrape.
+_DISPATCHARR_INFO_HEADER = _header('dispatcharr_info', 'Dispatcharr version and instance information')
+_EXPORTER_HEADERS = ''.join((
+    _header('dispatcharr_exporter_info', 'Dispatcharr Exporter plugin version information'),
+    _header('dispatcharr_exporter_settings_info', 'Dispatcharr Exporter plugin settings (for debugging/support)'),
+    _header('dispatcharr_exporter_port', 'Configured port number for the metrics server'),
+))
+_M3U_ACCOUNTS_HEADER = _header('dispatcharr_m3u_accounts', 'Total number of M3U accounts')
+_M3U_ACCOUNT_STATUS_HEADER = _header('dispatcharr_m3u_account_status', 'M3U account status breakdown')
+_M3U_ACCOUNT_STREAM_COUNT_HEADER = _header('dispatcharr_m3u_account_stream_count', 'Number of streams configured for this M3U account')
+_CHANNELS_HEADER = _header('dispatcharr_channels', 'Total number of channels')
+_CHANNEL_GROUPS_HEADER = _header('dispatcharr_channel_groups', 'Total number of channel groups')
+_PROFILE_CONNECTION_HEADERS = ''.join((
+    _header('dispatcharr_profile_connections', 'Current connections per M3U profile'),
+    _header('dispatcharr_profile_max_connections', 'Maximum allowed connections per M3U profile'),
+    _header('dispatcharr_profile_connection_usage', 'Connection usage ratio per M3U profile'),
+))
+_PROFILE_EXPIRY_HEADER = _header('dispatcharr_profile_days_to_expiry', 'Days remaining until XC profile expiry (0 if expired, -1 if no expiry set)')
+_STREAM_HEADERS = ''.join((
+    _header('dispatcharr_active_streams', 'Total number of active streams (live and VOD)'),
+    _header('dispatcharr_stream_channel_number', 'Channel number for active stream (live only)'),
+    _header('dispatcharr_stream_id', 'Active stream ID for channel or session ID for VOD'),
+    _header('dispatcharr_stream_index', 'Active stream index for channel (0=primary, >0=fallback) (live only)'),
+    _header('dispatcharr_stream_available_streams', 'Total number of streams configured for channel (live only)'),
+    _header('dispatcharr_stream_metadata', 'Stream metadata (type: live/vod, state values: active, waiting_for_clients, buffering, stopping, error, unknown)'),
+    _header('dispatcharr_stream_programming', 'Current EPG program information for active streams (live only)'),
+    _header('dispatcharr_stream_uptime_seconds', 'Stream uptime in seconds since stream started', 'counter'),
+    _header('dispatcharr_stream_active_clients', 'Number of active clients connected to stream'),
+    _header('dispatcharr_stream_video_bitrate_bps', 'Video bitrate in bits per second'),
+    _header('dispatcharr_stream_transcode_bitrate_bps', 'Transcode output bitrate in bits per second'),
+    _header('dispatcharr_stream_avg_bitrate_bps', 'Average bitrate in bits per second'),
+    _header('dispatcharr_stream_current_bitrate_bps', 'Current bitrate in bits per second (sum of all client rates)'),
+    _header('dispatcharr_stream_total_transfer_mb', 'Total data transferred in megabytes', 'counter'),
+    _header('dispatcharr_stream_fps', 'Stream frames per second'),
+    _header('dispatcharr_stream_buffering_speed', 'Stream buffering speed multiplier (e.g., 1.0 = realtime, 2.0 = 2x speed)'),
+    _header('dispatcharr_stream_profile_connections', 'Current connections for the M3U profile used by this stream'),
+    _header('dispatcharr_stream_profile_max_connections', 'Maximum connections allowed for the M3U profile'),
+))
+_EPG_SOURCES_HEADER = _header('dispatcharr_epg_sources', 'Total number of EPG sources')
+_EPG_SOURCE_STATUS_HEADER = _header('dispatcharr_epg_source_status', 'EPG source status breakdown')
+_EPG_SOURCE_PRIORITY_HEADER = _header('dispatcharr_epg_source_priority', 'Priority value for EPG source (lower is higher priority)')
+_CLIENT_HEADERS = ''.join((
+    _header('dispatcharr_active_clients', 'Total number of active client connections (live and VOD)'),
+    _header('dispatcharr_client_info', 'Client connection metadata (type: live/vod)'),
+    _header('dispatcharr_client_connection_duration_seconds', 'Duration of client connection in seconds'),
+    _header('dispatcharr_client_bytes_sent', 'Total bytes sent to client', 'counter'),
+    _header('dispatcharr_client_avg_transfer_rate_bps', 'Average transfer rate to client in bits per second'),
+    _header('dispatcharr_client_current_transfer_rate_bps', 'Current transfer rate to client in bits per second'),
+))
+_USER_HEADERS = ''.join((
+    _header('dispatcharr_user_info', 'Dispatcharr user information'),
+    _header('dispatcharr_user_date_joined_timestamp', 'Unix timestamp of when the user account was created'),
+    _header('dispatcharr_user_stream_limit', 'Configured concurrent stream limit for user (0 = unlimited)'),
+    _header('dispatcharr_user_active_streams', 'Current number of active streams for user'),
+))
+
+
+def _escape_user_agent(value) -> str:
+    """Escape a client user agent for a label value, replacing line breaks."""
+    if not value:
+        return ""
+    return str(value).translate(_USER_AGENT_ESCAPES)
+
+
+def _gevent_patched() -> bool:
+    """Return True if gevent has monkey-patched sockets and threading."""
+    return (
+        gevent is not None
+        and monkey.is_module_patched('socket')
+        and monkey.is_module_patched('threading')
+    )
+
+
+def _safe_float(value, default: float = 0.0) -> float:
+    """Parse *value* as a float, returning *default* if it is empty or malformed."""
+    if not value:
+        return default
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return default
+
+
+def _safe_int(value, default: int = 0) -> int:
+    """Parse *value* as an int, returning *default* if it is empty or malformed."""
+    if not value:
+        return default
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return default
+
+
+def _rate_to_bps(rate: float) -> float:
+    """Convert a proxy-reported ``*_KBps`` rate to bits per second.
+
+    Values above 50000 are already in bytes per second, not KB/s, so they
+    are only multiplied by 8.
+    """
+    return rate * 8 if rate > 50000 else rate * 8000
+
+
+def _transfer_stats(total_bytes: int, elapsed_seconds: int):
+    """Return ``(total_mb, avg_bitrate_bps)`` for *total_bytes* sent over *elapsed_seconds*."""
+    total_mb = round(total_bytes / 1024 / 1024, 2)
+    avg_bitrate_bps = round((total_bytes * 8 / elapsed_seconds), 2) if elapsed_seconds > 0 else 0
+    return total_mb, avg_bitrate_bps
+
 
 class PrometheusMetricsCollector:
     """Orchestrates all metric collection and formats output."""
 
     def __init__(self):
         self.redis_client = None  # lazy-loaded on first scrape
+        self._cache = {}          # key -> (loaded_at, value); see _cached()
+        self._info_block = None   # (inputs, data); see _info_section()
 
     def collect_metrics(self, settings: dict = None) -> str:
         """Collect all metrics and return Prometheus text format."""
-        if self.redis_client is None:
-            try:
-                from core.utils import RedisClient
-                self.redis_client = RedisClient.get_client()
-            except Exception as e:
-                logger.warning(f"Could not connect to Redis: {e}")
-
-        metrics = []
-        settings = settings or {}
+        return b"".join(self._iter_sections(settings)).decode('utf-8')
 
-        dispatcharr_version, dispatcharr_timestamp, full_version = get_dispatcharr_version()
+    def collect_metrics_iter(self, settings: dict = None):
+        """Yield the Prometheus text output as UTF-8 chunks, one per section.
 
-        # Dispatcharr version info
-        metrics.append("# HELP dispatcharr_info Dispatcharr version and instance information")
-        metrics.append("# TYPE dispatcharr_info gauge")
-        metrics.append(f'dispatcharr_info{{version="{full_version}"}} 1')
-        metrics.append("")
-
-        # Exporter info / settings snapshot
-        exporter_version = PLUGIN_CONFIG["version"].lstrip('-')
-        metrics.append("# HELP dispatcharr_exporter_info Dispatcharr Exporter plugin version information")
-        metrics.append("# TYPE dispatcharr_exporter_info gauge")
-        metrics.append("# HELP dispatcharr_exporter_settings_info Dispatcharr Exporter plugin settings (for debugging/support)")
-        metrics.append("# TYPE dispatcharr_exporter_settings_info gauge")
-        metrics.append("# HELP dispatcharr_exporter_port Configured port number for the metrics server")
-        metrics.append("# TYPE dispatcharr_exporter_port gauge")
-        metrics.append(f'dispatcharr_exporter_info{{version="{exporter_version}"}} 1')
+        Lets the WSGI server start sending before later sections are collected.
+        """
+        return self._iter_sections(settings)
 
-        settings_labels = []
-        port_value = DEFAULT_PORT
+    def _iter_sections(self, settings: dict = None):
+        """Collect all metrics, yielding each section UTF-8 encoded, in order."""
+        if self.redis_client is None:
+            redis_client = get_redis_client()
+            if redis_client is not None:
+                self.redis_client = get_decoded_redis_client(redis_client)
+            else:
+                logger.warning("Could not connect to Redis")
 
-        for field in PLUGIN_FIELDS:
-            field_id = field['id']
-            field_value = settings.get(field_id, field['default']) if settings else field['default']
+        settings = settings or {}
 
-            if field_id == 'port':
-                port_value = field_value
+        if User is None and not _import_models():
+            logger.warning("Django app registry is not ready, model metrics are skipped")
 
-            if isinstance(field_value, bool):
-                value_str = str(field_value).lower()
-            elif isinstance(field_value, (int, float)):
-                value_str = str(field_value)
-            else:
-                value_str = str(field_value).replace('\\', '\\\\').replace('"', '\\"')
+        # The info block needs no I/O; hand it out before collecting the rest.
+        yield self._info_section(settings)
 
-            settings_labels.append(f'{field_id}="{value_str}"')
+        # VOD connections feed the profile, stream, client and user sections;
+        # the live channel snapshot feeds the profile and stream sections.
+        # Each is read once per scrape and shared.
+        vod_connections, live_streams = self._fetch_snapshots()
 
-        metrics.append(f'dispatcharr_exporter_settings_info{{{",".join(settings_labels)}}} 1')
-        metrics.append(f'dispatcharr_exporter_port {port_value}')
-        metrics.append("")
+        # Each section is an independent (collector, *args) job; see
+        # _run_sections() for how they are scheduled.
+        sections = []
 
         # M3U Account metrics
         if not settings or settings.get('include_m3u_stats', True):
-            metrics.extend(self._collect_m3u_account_metrics(settings))
+            sections.append((self._collect_m3u_account_metrics, settings))
 
         # EPG Source metrics
         if settings and settings.get('include_epg_stats', False):
-            metrics.extend(self._collect_epg_metrics(settings))
+            sections.append((self._collect_epg_metrics, settings))
 
         # Channel metrics
-        metrics.extend(self._collect_channel_metrics())
+        sections.append((self._collect_channel_metrics,))
 
         # Profile connection metrics
         if not settings or settings.get('include_m3u_stats', True):
-            metrics.extend(self._collect_profile_metrics())
+            sections.append((self._collect_profile_metrics, vod_connections, live_streams))
 
         # Stream metrics (live + VOD)
-        metrics.extend(self._collect_stream_metrics(settings))
+        sections.append((self._collect_stream_metrics, settings, vod_connections, live_streams))
 
         # Client connection metrics
         if settings and settings.get('include_client_stats', False):
-            metrics.extend(self._collect_client_metrics())
+            sections.append((self._collect_client_metrics, vod_connections))
 
         # User metrics
         if settings and settings.get('include_user_stats', False):
-            metrics.extend(self._collect_user_metrics())
+            sections.append((self._collect_user_metrics, vod_connections))
+
+        yield from self._run_sections(sections)
+
+    def _info_section(self, settings: dict) -> bytes:
+        """Return the version and settings info block, UTF-8 encoded.
+
+        Its inputs only change on a redeploy or a settings save, so the
+        encoded block is kept and rebuilt only when the version or a setting
+        value differs from the previous scrape.
+        """
+        full_version = get_dispatcharr_version()[2]
+        field_values = tuple(settings.get(field['id'], field['default']) for field in PLUGIN_FIELDS)
+        key = (full_version, field_values)
+        if self._info_block is not None and self._info_block[0] == key:
+            return self._info_block[1]
+
+        out = io.StringIO()
+        write = out.write
+
+        # Dispatcharr version info
+        write(_DISPATCHARR_INFO_HEADER)
+        write(f'dispatcharr_info{{version="{full_version}"}} 1\n')
+        write("\n")
+
+        # Exporter info / settings snapshot
+        write(_EXPORTER_HEADERS)
+        write(_EXPORTER_INFO_LINE)
+
+        settings_labels = []
+        port_value = DEFAULT_PORT
+
+        for field, field_value in zip(PLUGIN_FIELDS, field_values):
+            field_id = field['id']
+
+            if field_id == 'port':
+                port_value = field_value
+
+            if isinstance(field_value, bool):
+                value_str = str(field_value).lower()
+            elif isinstance(field_value, (int, float)):
+                value_str = str(field_value)
+            else:
+                value_str = escape_label(field_value)
+
+            settings_labels.append(f'{field_id}="{value_str}"')
+
+        write(f'dispatcharr_exporter_settings_info{{{",".join(settings_labels)}}} 1\n')
+        write(f'dispatcharr_exporter_port {port_value}\n')
+        write("\n")
+
+        data = out.getvalue().encode('utf-8')
+        self._info_block = (key, data)
+        return data
+
+    def _fetch_snapshots(self):
+        """Return ``(vod_connections, live_streams)`` for the sections to share.
+
+        With gevent patched, the VOD scan (Redis only) runs in a greenlet
+        while the live read, which also queries Channel through the ORM, stays
+        on the calling greenlet so it reuses that greenlet's database
+        connection.  A failed read falls back to ``[]`` / ``None``.
+        """
+        vod_snapshot = (self._fetch_vod_connections, [], "scanning VOD connection keys")
+        fetch_live = self._fetch_live_streams if self.redis_client else (lambda: None)
+        live_snapshot = (fetch_live, None, "reading live stream state")
+        if _gevent_patched():
+            vod_job = gevent.spawn(self._load_snapshot, *vod_snapshot)
+            live_streams = self._load_snapshot(*live_snapshot)
+            return vod_job.get(), live_streams
+        return self._load_snapshot(*vod_snapshot), self._load_snapshot(*live_snapshot)
+
+    @staticmethod
+    def _load_snapshot(fetch, fallback, action: str):
+        """Return ``fetch()``, or *fallback* if it raises."""
+        try:
+            return fetch()
+        except Exception as e:
+            logger.debug(f"Error {action}: {e}")
+            return fallback
+
+    def _run_sections(self, sections):
+        """Run ``(collect, *args)`` sections and yield their encoded output in order.
+
+        The sections run one after another on the calling greenlet, each
+        yielded as it finishes.  Every section queries the database, and under
+        patched threading a Django connection is greenlet-local: spawning the
+        sections would open and close up to seven Postgres connections per
+        scrape (times the number of concurrent scrapes), bypassing
+        ``CONN_MAX_AGE`` reuse.  The cost is that their waits do not overlap;
+        only the Redis-only VOD snapshot is read concurrently, see
+        _fetch_snapshots().
+        """
+        for section in sections:
+            yield self._render_section(*section)
+
+    @staticmethod
+    def _render_section(collect, *args) -> bytes:
+        """Render one section into its own buffer and return it UTF-8 encoded."""
+        out = io.StringIO()
+        collect(out, *args)
+        return out.getvalue().encode('utf-8')
+
+    # ── Reference data cache ─────────────────────────────────────────────────
+
+    def _cached(self, key: str, loader, ttl: float = None):
+        """Return ``loader()``, reusing the previous result for up to *ttl* seconds.
+
+        Used for small reference tables (stream profiles, M3U profiles,
+        channel group counts) that change far less often than Prometheus
+        scrapes them.
+        """
+        if ttl is None:
+            ttl = _REFERENCE_CACHE_TTL
+        now = time.monotonic()
+        hit = self._cache.get(key)
+        if hit is not None and now - hit[0] < ttl:
+            return hit[1]
+        value = loader()
+        self._cache[key] = (now, value)
+        return value
+
+    def _get_m3u_profiles(self) -> dict:
+        """Return all M3U account profiles (with their account) keyed by id."""
+        return self._cached(
+            'm3u_profiles',
+            lambda: M3UAccountProfile.objects.select_related('m3u_account').in_bulk(),
+        )
+
+    def _get_stream_profiles(self) -> dict:
+        """Return all stream profiles keyed by id."""
+        return self._cached('stream_profiles', lambda: StreamProfile.objects.in_bulk())
+
+    # ── Redis helpers ────────────────────────────────────────────────────────
+
+    def _pipeline(self, commands) -> list:
+        """Execute ``(method, *args)`` tuples in one non-transactional round-trip.
+
+        Per-command errors come back as ``None`` so a single bad key cannot
+        discard the rest of the batch.
+        """
+        commands = list(commands)
+        if not commands:
+            return []
+        pipe = self.redis_client.pipeline(transaction=False)
+        for method, *args in commands:
+            getattr(pipe, method)(*args)
+        return [None if isinstance(r, Exception) else r for r in pipe.execute(raise_on_error=False)]
+
+    def _fetch_live_streams(self):
+        """Resolve every ``channel_stream:*`` key and its Redis state in bulk.
+
+        Returns ``(key_count, entries)`` where each entry describes one live
+        channel that still exists in the database.  All per-channel Redis
+        reads are batched into a fixed number of round-trips (SCAN, MGET and
+        pipelines) instead of several commands per stream.
+        """
+        stream_keys = list(self.redis_client.scan_iter(match="channel_stream:*", count=_SCAN_COUNT))
+        if not stream_keys:
+            return 0, []
+
+        # Phase 1: channel id -> stream id for every key in a single MGET
+        pending = []
+        for key, raw_stream_id in zip(stream_keys, self.redis_client.mget(stream_keys)):
+            try:
+                if raw_stream_id:
+                    channel_id = int(key.split(':', 1)[1])
+                    pending.append((channel_id, int(raw_stream_id)))
+            except Exception as e:
+                logger.debug(f"Error processing stream key {key}: {e}")
+
+        # Each channel's stream count comes back as an annotation on the
+        # same query rather than a COUNT per channel later on.
+        channels = Channel.objects.select_related('logo', 'channel_group').annotate(
+            available_streams=Count('streams'),
+        ).in_bulk([channel_id for channel_id, _ in pending])
+        entries = []
+        for channel_id, stream_id in pending:
+            channel = channels.get(channel_id)
+            if channel is None:
+                logger.debug(f"Channel {channel_id} not found in database")
+                continue
+            entries.append({'channel': channel, 'stream_id': stream_id})
+
+        # Phase 2: metadata fields and client set for every channel
+        replies = self._pipeline(
+            cmd
+            for entry in entries
+            for cmd in (
+                ('hmget', f"{_CHANNEL_KEY_PREFIX}:channel:{entry['channel'].uuid}:metadata", *_STREAM_META_FIELDS),
+                ('smembers', f"{_CHANNEL_KEY_PREFIX}:channel:{entry['channel'].uuid}:clients"),
+            )
+        )
+        for entry, values, client_ids in zip(entries, replies[0::2], replies[1::2]):
+            metadata = {
+                field: value
+                for field, value in zip(_STREAM_META_FIELDS, values or ())
+                if value is not None
+            }
+            entry['metadata'] = metadata
+            entry['client_ids'] = list(client_ids or ())
+
+            active_stream_id_str = metadata.get(_F_STREAM_ID)
+            if active_stream_id_str is not None:
+                active_stream_id_str = str(active_stream_id_str)
+            if active_stream_id_str and active_stream_id_str != '0':
+                try:
+                    entry['stream_id'] = int(active_stream_id_str)
+                except (ValueError, TypeError):
+                    logger.debug(f"Invalid active stream ID in metadata: {active_stream_id_str}")
+
+            m3u_profile_id = metadata.get(_F_M3U_PROFILE)
+            entry['m3u_profile_id'] = str(m3u_profile_id) if m3u_profile_id is not None else None
+
+        # Phase 3: each client's current rate (for the stream bitrate) and the
+        # stream_profile fallback for channels without a profile in metadata
+        commands = []
+        for entry in entries:
+            uuid = entry['channel'].uuid
+            for client_id in entry['client_ids']:
+                commands.append(('hget', f"{_CHANNEL_KEY_PREFIX}:channel:{uuid}:clients:{client_id}", 'current_rate_KBps'))
+            if not entry['m3u_profile_id'] or entry['m3u_profile_id'] == '0':
+                commands.append(('get', f"stream_profile:{entry['stream_id']}"))
+        replies = iter(self._pipeline(commands))
+        for entry in entries:
+            current_bitrate_bps = 0.0
+            for _ in entry['client_ids']:
+                rate = next(replies)
+                try:
+                    if rate is not None:
+                        current_bitrate_bps += _rate_to_bps(float(rate))
+                except Exception:
+                    pass
+            entry['current_bitrate_bps'] = current_bitrate_bps
+            if not entry['m3u_profile_id'] or entry['m3u_profile_id'] == '0':
+                raw = next(replies)
+                if raw:
+                    entry['m3u_profile_id'] = raw
+
+        # Phase 4: connection counters for every referenced M3U profile
+        counts = self._fetch_profile_connections(entry['m3u_profile_id'] for entry in entries)
+        for entry in entries:
+            try:
+                entry['profile_connections'] = counts.get(int(entry['m3u_profile_id']), 0)
+            except (ValueError, TypeError):
+                entry['profile_connections'] = 0
 
-        return "\n".join(metrics)
+        return len(stream_keys), entries
+
+    def _fetch_profile_connections(self, profile_ids) -> dict:
+        """Return ``{profile_id: connection_count}`` for the given M3U profile ids.
+
+        Accepts raw ids as read from Redis; blank, ``'0'`` and unparsable ids
+        are skipped.  Every counter is read in a single MGET.
+        """
+        unique_ids = []
+        for raw_id in profile_ids:
+            try:
+                if raw_id and raw_id != '0':
+                    unique_ids.append(int(raw_id))
+            except (ValueError, TypeError):
+                pass
+        unique_ids = list(dict.fromkeys(unique_ids))
+        counts = {}
+        if unique_ids:
+            raw_counts = self.redis_client.mget([f"profile_connections:{pid}" for pid in unique_ids])
+            for pid, raw in zip(unique_ids, raw_counts):
+                try:
+                    counts[pid] = int(raw or 0)
+                except (ValueError, TypeError):
+                    counts[pid] = 0
+        return counts
+
+    def _fetch_vod_connections(self) -> list:
+        """Return ``(session_id, fields)`` for every VOD persistent connection.
+
+        The keyspace is scanned once and every hash is fetched in a single
+        pipeline; empty hashes are dropped.
+        """
+        if not self.redis_client:
+            return []
+        keys = list(self.redis_client.scan_iter(match="vod_persistent_connection:*", count=_SCAN_COUNT))
+        connections = []
+        for key, data in zip(keys, self._pipeline(('hgetall', key) for key in keys)):
+            if data:
+                connections.append((key.replace('vod_persistent_connection:', ''), data))
+        return connections
 
     # ── M3U Account metrics ──────────────────────────────────────────────────
 
-    def _collect_m3u_account_metrics(self, settings: dict = None) -> list:
+    def _collect_m3u_account_metrics(self, out, settings: dict = None) -> None:
         """Collect M3U account statistics."""
-        from apps.m3u.models import M3UAccount
-
-        metrics = []
-        metrics.append("# HELP dispatcharr_m3u_accounts Total number of M3U accounts")
-        metrics.append("# TYPE dispatcharr_m3u_accounts gauge")
+        write = out.write
+        write(_M3U_ACCOUNTS_HEADER)
 
         include_urls = settings and settings.get('include_source_urls', False)
 
         try:
             all_accounts = M3UAccount.objects.exclude(name__iexact="custom")
-            total_accounts = all_accounts.count()
-            active_accounts = all_accounts.filter(is_active=True).count()
 
-            metrics.append(f"dispatcharr_m3u_accounts{{status=\"total\"}} {total_accounts}")
-            metrics.append(f"dispatcharr_m3u_accounts{{status=\"active\"}} {active_accounts}")
+            # Totals and the per-status breakdown in a single aggregate query
+            stats = all_accounts.aggregate(**_M3U_ACCOUNT_AGGREGATES)
+
+            write(f"dispatcharr_m3u_accounts{{status=\"total\"}} {stats['total']}\n")
+            write(f"dispatcharr_m3u_accounts{{status=\"active\"}} {stats['active']}\n")
 
-            metrics.append("# HELP dispatcharr_m3u_account_status M3U account status breakdown")
-            metrics.append("# TYPE dispatcharr_m3u_account_status gauge")
+            write(_M3U_ACCOUNT_STATUS_HEADER)
 
-            for status_choice in M3UAccount.Status.choices:
-                status_value = status_choice[0]
-                count = all_accounts.filter(status=status_value).count()
-                metrics.append(f'dispatcharr_m3u_account_status{{status="{status_value}"}} {count}')
+            for i, status_value in enumerate(_M3U_STATUS_VALUES):
+                write(f'dispatcharr_m3u_account_status{{status="{status_value}"}} {stats[f"status_{i}"]}\n')
 
-            metrics.append("# HELP dispatcharr_m3u_account_stream_count Number of streams configured for this M3U account")
-            metrics.append("# TYPE dispatcharr_m3u_account_stream_count gauge")
+            write(_M3U_ACCOUNT_STREAM_COUNT_HEADER)
 
-            for account in all_accounts:
-                account_name = account.name.replace('"', '\\"').replace('\\', '\\\\')
-                account_type = account.account_type or 'unknown'
-                status = account.status
-                is_active = str(account.is_active).lower()
-                stream_count = account.streams.count() if hasattr(account, 'streams') else 0
+            # Plain dicts instead of model instances: only the labelled columns are read
+            account_rows = all_accounts.annotate(stream_count=Count('streams')).values(
+                'id', 'name', 'account_type', 'status', 'is_active', 'username', 'server_url', 'stream_count',
+            )
+            for account in account_rows.iterator():
+                account_name = escape_label(account['name'])
+                account_type = account['account_type'] or 'unknown'
+                status = account['status']
+                is_active = str(account['is_active']).lower()
+                stream_count = account['stream_count']
 
                 base_labels = [
-                    f'account_id="{account.id}"',
+                    f'account_id="{account["id"]}"',
                     f'account_name="{account_name}"',
                     f'account_type="{account_type}"',
                     f'status="{status}"',
                     f'is_active="{is_active}"',
                 ]
 
-                if include_urls and account_type == 'XC' and hasattr(account, 'username') and account.username:
-                    username = account.username.replace('"', '\\"').replace('\\', '\\\\')
+                if include_urls and account_type == 'XC' and account['username']:
+                    username = escape_label(account['username'])
                     base_labels.append(f'username="{username}"')
 
-                if include_urls and account.server_url:
-                    server_url = account.server_url.replace('"', '\\"').replace('\\', '\\\\')
+                if include_urls and account['server_url']:
+                    server_url = escape_label(account['server_url'])
                     base_labels.append(f'server_url="{server_url}"')
 
-                metrics.append(f'dispatcharr_m3u_account_info{{{",".join(base_labels)}}} 1')
-                metrics.append(f'dispatcharr_m3u_account_stream_count{{{",".join(base_labels)}}} {stream_count}')
+                base_labels_str = ",".join(base_labels)
+                write(f'dispatcharr_m3u_account_info{{{base_labels_str}}} 1\n')
+                write(f'dispatcharr_m3u_account_stream_count{{{base_labels_str}}} {stream_count}\n')
 
         except Exception as e:
             logger.error(f"Error collecting M3U account metrics: {e}")
 
-        metrics.append("")
-        return metrics
+        write("\n")
 
     # ── Channel metrics ──────────────────────────────────────────────────────
 
-    def _collect_channel_metrics(self) -> list:
+    def _collect_channel_metrics(self, out) -> None:
         """Collect channel statistics."""
-        from apps.channels.models import Channel, ChannelGroup
-
-        metrics = []
-        metrics.append("# HELP dispatcharr_channels Total number of channels")
-        metrics.append("# TYPE dispatcharr_channels gauge")
+        write = out.write
+        write(_CHANNELS_HEADER)
 
         try:
             total_channels = Channel.objects.count()
-            metrics.append(f"dispatcharr_channels{{status=\"total\"}} {total_channels}")
+            write(f"dispatcharr_channels{{status=\"total\"}} {total_channels}\n")
 
-            metrics.append("# HELP dispatcharr_channel_groups Total number of channel groups")
-            metrics.append("# TYPE dispatcharr_channel_groups gauge")
-            channel_groups = ChannelGroup.objects.count()
-            metrics.append(f"dispatcharr_channel_groups {channel_groups}")
+            write(_CHANNEL_GROUPS_HEADER)
+            channel_groups = self._cached('channel_group_count', ChannelGroup.objects.count)
+            write(f"dispatcharr_channel_groups {channel_groups}\n")
 
         except Exception as e:
             logger.error(f"Error collecting channel metrics: {e}")
 
-        metrics.append("")
-        return metrics
+        write("\n")
 
     # ── Profile metrics ──────────────────────────────────────────────────────
 
-    def _collect_profile_metrics(self) -> list:
+    def _collect_profile_metrics(self, out, vod_connections: list = None, live_streams: tuple = None) -> None:
         """Collect M3U profile connection statistics."""
-        from apps.m3u.models import M3UAccountProfile
-        from datetime import datetime, timezone
-
-        metrics = []
-        profile_data = []
-        expiry_data = []
+        write = out.write
+        profile_data = io.StringIO()
+        expiry_data = io.StringIO()
 
         try:
             if self.redis_client:
                 actual_profile_connections = {}
 
-                # Count live channel streams
+                # Count live channel streams from the profile field already
+                # read into the shared live snapshot.
                 try:
-                    for key in self.redis_client.scan_iter(match="channel_stream:*"):
-                        try:
-                            key_str = key.decode('utf-8') if isinstance(key, bytes) else key
-                            channel_id = key_str.split(':', 1)[1]
-
-                            from apps.channels.models import Channel
+                    if live_streams is None:
+                        live_streams = self._fetch_live_streams()
+                    for entry in live_streams[1]:
+                        m3u_profile_id = entry['metadata'].get(_F_M3U_PROFILE)
+                        if m3u_profile_id and m3u_profile_id != '0':
                             try:
-                                channel = Channel.objects.get(id=int(channel_id))
-                                channel_uuid = str(channel.uuid)
-
-                                metadata_key = f"{_CHANNEL_KEY_PREFIX}:channel:{channel_uuid}:metadata"
-                                metadata = self.redis_client.hgetall(metadata_key) or {}
-
-                                def get_metadata(field, default=None):
-                                    val = metadata.get(field)
-                                    if val is None:
-                                        return default
-                                    return str(val)
-
-                                m3u_profile_id = get_metadata(ChannelMetadataField.M3U_PROFILE, None)
-                                if m3u_profile_id and m3u_profile_id != '0':
-                                    try:
-                                        profile_id = int(m3u_profile_id)
-                                        actual_profile_connections[profile_id] = actual_profile_connections.get(profile_id, 0) + 1
-                                    except (ValueError, TypeError):
-                                        pass
-                            except Channel.DoesNotExist:
+                                profile_id = int(m3u_profile_id)
+                                actual_profile_connections[profile_id] = actual_profile_connections.get(profile_id, 0) + 1
+                            except (ValueError, TypeError):
                                 pass
-                        except Exception as e:
-                            logger.debug(f"Error processing stream key for profile counting: {e}")
                 except Exception as e:
                     logger.debug(f"Error calculating live channel profile connections: {e}")
 
                 # Count VOD connections
-                try:
-                    for key in self.redis_client.scan_iter(match="vod_persistent_connection:*"):
-                        try:
-                            connection_data = self.redis_client.hgetall(key)
-                            if connection_data:
-                                if isinstance(list(connection_data.keys())[0], bytes):
-                                    m3u_profile_id = connection_data.get(b'm3u_profile_id', b'')
-                                    active_streams = connection_data.get(b'active_streams', b'0')
-                                    if isinstance(m3u_profile_id, bytes):
-                                        m3u_profile_id = m3u_profile_id.decode('utf-8')
-                                    if isinstance(active_streams, bytes):
-                                        active_streams = active_streams.decode('utf-8')
-                                else:
-                                    m3u_profile_id = connection_data.get('m3u_profile_id', '')
-                                    active_streams = connection_data.get('active_streams', '0')
-
-                                if m3u_profile_id and int(active_streams) > 0:
-                                    try:
-                                        profile_id = int(m3u_profile_id)
-                                        actual_profile_connections[profile_id] = actual_profile_connections.get(profile_id, 0) + 1
-                                    except (ValueError, TypeError):
-                                        pass
-                        except Exception as e:
-                            logger.debug(f"Error processing VOD connection key for profile counting: {e}")
-                except Exception as e:
-                    logger.debug(f"Error calculating VOD profile connections: {e}")
+                if vod_connections is None:
+                    vod_connections = self._fetch_vod_connections()
+                for _session_id, connection_data in vod_connections:
+                    try:
+                        m3u_profile_id = connection_data.get('m3u_profile_id', '')
+                        active_streams = connection_data.get('active_streams', '0')
+                        if m3u_profile_id and int(active_streams) > 0:
+                            try:
+                                profile_id = int(m3u_profile_id)
+                                actual_profile_connections[profile_id] = actual_profile_connections.get(profile_id, 0) + 1
+                            except (ValueError, TypeError):
+                                pass
+                    except Exception as e:
+                        logger.debug(f"Error processing VOD connection key for profile counting: {e}")
 
-                for profile in M3UAccountProfile.objects.all():
+                # Whole days to each XC expiry are plain epoch arithmetic
+                # against one timestamp taken for the whole loop.
+                now_ts = time.time()
+                for profile in self._get_m3u_profiles().values():
                     try:
                         if profile.m3u_account.name.lower() == 'custom':
                             continue
 
                         current_connections = actual_profile_connections.get(profile.id, 0)
                         max_connections = profile.max_streams
-                        profile_name = profile.name.replace('"', '\\"')
-                        account_name = profile.m3u_account.name.replace('"', '\\"')
+                        profile_name = escape_label(profile.name)
+                        account_name = escape_label(profile.m3u_account.name)
 
-                        profile_data.append(f'dispatcharr_profile_connections{{profile_id="{profile.id}",profile_name="{profile_name}",account_name="{account_name}"}} {current_connections}')
-                        profile_data.append(f'dispatcharr_profile_max_connections{{profile_id="{profile.id}",profile_name="{profile_name}",account_name="{account_name}"}} {max_connections}')
+                        profile_data.write(f'dispatcharr_profile_connections{{profile_id="{profile.id}",profile_name="{profile_name}",account_name="{account_name}"}} {current_connections}\n')
+                        profile_data.write(f'dispatcharr_profile_max_connections{{profile_id="{profile.id}",profile_name="{profile_name}",account_name="{account_name}"}} {max_connections}\n')
 
                         if max_connections > 0:
                             usage = current_connections / max_connections
-                            profile_data.append(f'dispatcharr_profile_connection_usage{{profile_id="{profile.id}",profile_name="{profile_name}",account_name="{account_name}"}} {usage:.4f}')
+                            profile_data.write(f'dispatcharr_profile_connection_usage{{profile_id="{profile.id}",profile_name="{profile_name}",account_name="{account_name}"}} {usage:.4f}\n')
 
                         if profile.m3u_account.account_type == 'XC':
                             days_remaining = -1
@@ -297,12 +791,10 @@ class PrometheusMetricsCollector:
                                 exp_date = user_info.get('exp_date')
                                 if exp_date:
                                     try:
-                                        expiry = datetime.fromtimestamp(float(exp_date), tz=timezone.utc)
-                                        now = datetime.now(timezone.utc)
-                                        days_remaining = max(0, (expiry - now).days)
+                                        days_remaining = max(0, int((float(exp_date) - now_ts) // 86400))
                                     except (ValueError, TypeError) as e:
                                         logger.debug(f"Error calculating expiry for profile {profile.id}: {e}")
-                            expiry_data.append(f'dispatcharr_profile_days_to_expiry{{profile_id="{profile.id}",profile_name="{profile_name}",account_name="{account_name}"}} {days_remaining}')
+                            expiry_data.write(f'dispatcharr_profile_days_to_expiry{{profile_id="{profile.id}",profile_name="{profile_name}",account_name="{account_name}"}} {days_remaining}\n')
 
                     except Exception as e:
                         logger.debug(f"Error getting connections for profile {profile.id}: {e}")
@@ -310,369 +802,277 @@ class PrometheusMetricsCollector:
         except Exception as e:
             logger.error(f"Error collecting profile metrics: {e}")
 
-        if profile_data:
-            metrics.append("# HELP dispatcharr_profile_connections Current connections per M3U profile")
-            metrics.append("# TYPE dispatcharr_profile_connections gauge")
-            metrics.append("# HELP dispatcharr_profile_max_connections Maximum allowed connections per M3U profile")
-            metrics.append("# TYPE dispatcharr_profile_max_connections gauge")
-            metrics.append("# HELP dispatcharr_profile_connection_usage Connection usage ratio per M3U profile")
-            metrics.append("# TYPE dispatcharr_profile_connection_usage gauge")
-            metrics.extend(profile_data)
+        if profile_data.tell():
+            write(_PROFILE_CONNECTION_HEADERS)
+            write(profile_data.getvalue())
 
-        if expiry_data:
-            metrics.append("# HELP dispatcharr_profile_days_to_expiry Days remaining until XC profile expiry (0 if expired, -1 if no expiry set)")
-            metrics.append("# TYPE dispatcharr_profile_days_to_expiry gauge")
-            metrics.extend(expiry_data)
+        if expiry_data.tell():
+            write(_PROFILE_EXPIRY_HEADER)
+            write(expiry_data.getvalue())
 
-        metrics.append("")
-        return metrics
+        write("\n")
 
     # ── Stream metrics ───────────────────────────────────────────────────────
 
-    def _collect_stream_metrics(self, settings: dict = None) -> list:
+    def _collect_stream_metrics(self, out, settings: dict = None, vod_connections: list = None, live_streams: tuple = None) -> None:
         """Collect active stream statistics from Redis."""
-        from apps.channels.models import Channel, Stream
-        from apps.m3u.models import M3UAccount, M3UAccountProfile
-
         settings = settings or {}
+        # Prefix for logo URLs, read from settings once rather than per stream
+        logo_base_url = (settings.get('base_url') or '').strip().rstrip('/')
 
-        metrics = []
-        metrics.append("# HELP dispatcharr_active_streams Total number of active streams (live and VOD)")
-        metrics.append("# TYPE dispatcharr_active_streams gauge")
-
-        metrics.append("# HELP dispatcharr_stream_channel_number Channel number for active stream (live only)")
-        metrics.append("# TYPE dispatcharr_stream_channel_number gauge")
-        metrics.append("# HELP dispatcharr_stream_id Active stream ID for channel or session ID for VOD")
-        metrics.append("# TYPE dispatcharr_stream_id gauge")
-        metrics.append("# HELP dispatcharr_stream_index Active stream index for channel (0=primary, >0=fallback) (live only)")
-        metrics.append("# TYPE dispatcharr_stream_index gauge")
-        metrics.append("# HELP dispatcharr_stream_available_streams Total number of streams configured for channel (live only)")
-        metrics.append("# TYPE dispatcharr_stream_available_streams gauge")
-        metrics.append("# HELP dispatcharr_stream_metadata Stream metadata (type: live/vod, state values: active, waiting_for_clients, buffering, stopping, error, unknown)")
-        metrics.append("# TYPE dispatcharr_stream_metadata gauge")
-        metrics.append("# HELP dispatcharr_stream_programming Current EPG program information for active streams (live only)")
-        metrics.append("# TYPE dispatcharr_stream_programming gauge")
-        metrics.append("# HELP dispatcharr_stream_uptime_seconds Stream uptime in seconds since stream started")
-        metrics.append("# TYPE dispatcharr_stream_uptime_seconds counter")
-        metrics.append("# HELP dispatcharr_stream_active_clients Number of active clients connected to stream")
-        metrics.append("# TYPE dispatcharr_stream_active_clients gauge")
-        metrics.append("# HELP dispatcharr_stream_video_bitrate_bps Video bitrate in bits per second")
-        metrics.append("# TYPE dispatcharr_stream_video_bitrate_bps gauge")
-        metrics.append("# HELP dispatcharr_stream_transcode_bitrate_bps Transcode output bitrate in bits per second")
-        metrics.append("# TYPE dispatcharr_stream_transcode_bitrate_bps gauge")
-        metrics.append("# HELP dispatcharr_stream_avg_bitrate_bps Average bitrate in bits per second")
-        metrics.append("# TYPE dispatcharr_stream_avg_bitrate_bps gauge")
-        metrics.append("# HELP dispatcharr_stream_current_bitrate_bps Current bitrate in bits per second (sum of all client rates)")
-        metrics.append("# TYPE dispatcharr_stream_current_bitrate_bps gauge")
-        metrics.append("# HELP dispatcharr_stream_total_transfer_mb Total data transferred in megabytes")
-        metrics.append("# TYPE dispatcharr_stream_total_transfer_mb counter")
-        metrics.append("# HELP dispatcharr_stream_fps Stream frames per second")
-        metrics.append("# TYPE dispatcharr_stream_fps gauge")
-        metrics.append("# HELP dispatcharr_stream_buffering_speed Stream buffering speed multiplier (e.g., 1.0 = realtime, 2.0 = 2x speed)")
-        metrics.append("# TYPE dispatcharr_stream_buffering_speed gauge")
-        metrics.append("# HELP dispatcharr_stream_profile_connections Current connections for the M3U profile used by this stream")
-        metrics.append("# TYPE dispatcharr_stream_profile_connections gauge")
-        metrics.append("# HELP dispatcharr_stream_profile_max_connections Maximum connections allowed for the M3U profile")
-        metrics.append("# TYPE dispatcharr_stream_profile_max_connections gauge")
+        write = out.write
+        write(_STREAM_HEADERS)
 
         try:
             if self.redis_client:
                 active_streams = 0
                 active_live_streams = 0
                 active_vod_streams = 0
-                stream_value_metrics = []
+                stream_values = io.StringIO()
 
                 # ── Live channel streams ─────────────────────────────────────
                 try:
-                    for key in self.redis_client.scan_iter(match="channel_stream:*"):
-                        active_streams += 1
-                        active_live_streams += 1
+                    if live_streams is None:
+                        live_streams = self._fetch_live_streams()
+                    live_key_count, live_streams = live_streams
+                    active_streams += live_key_count
+                    active_live_streams += live_key_count
+
+                    # Bulk-load every row the per-stream loop needs: one query
+                    # per table instead of several queries per active stream.
+                    stream_ids = {entry['stream_id'] for entry in live_streams}
+                    streams_by_id = Stream.objects.select_related('m3u_account').in_bulk(stream_ids)
+                    stream_orders = {
+                        (channel_id, stream_id): order
+                        for channel_id, stream_id, order in ChannelStream.objects.filter(
+                            channel_id__in=[entry['channel'].id for entry in live_streams],
+                            stream_id__in=stream_ids,
+                        ).values_list('channel_id', 'stream_id', 'order')
+                    }
+                    stream_profiles = self._get_stream_profiles()
+                    m3u_profiles = self._get_m3u_profiles()
+
+                    for entry in live_streams:
+                        channel = entry['channel']
+                        channel_id = channel.id
+                        stream_id = entry['stream_id']
+                        metadata = entry['metadata']
 
                         try:
-                            key_str = key.decode('utf-8') if isinstance(key, bytes) else key
-                            channel_id = key_str.split(':', 1)[1]
+                            # Skip a stream that no longer exists before any
+                            # label is formatted or profile looked up for it
+                            stream = streams_by_id.get(stream_id)
+                            if stream is None:
+                                logger.debug(f"Stream {stream_id} not found in database")
+                                continue
 
-                            stream_id = self.redis_client.get(key)
-                            if stream_id:
-                                stream_id = int(stream_id.decode('utf-8') if isinstance(stream_id, bytes) else stream_id)
+                            channel_uuid = str(channel.uuid)
+                            channel_name = escape_label(channel.name)
+                            channel_number = getattr(channel, 'channel_number', 'N/A')
+                            channel_group = escape_label(channel.channel_group.name) if channel.channel_group else "none"
+
+                            logo_url = ""
+                            if hasattr(channel, 'logo') and channel.logo:
+                                logo_url = f"{logo_base_url}/api/channels/logos/{channel.logo.id}/cache/"
+                            logo_url = escape_label(logo_url)
+
+                            init_time = float(metadata.get(_F_INIT_TIME, '0'))
+                            uptime_seconds = int(time.time() - init_time) if init_time > 0 else 0
 
+                            stream_profile_id = metadata.get(_F_STREAM_PROFILE, '0')
+                            stream_profile_name = 'Unknown'
+                            if stream_profile_id and stream_profile_id != '0':
                                 try:
-                                    channel = Channel.objects.select_related('logo', 'channel_group').get(id=int(channel_id))
-                                    channel_uuid = str(channel.uuid)
-                                    channel_name = channel.name.replace('"', '\\"').replace('\\', '\\\\')
-                                    channel_number = getattr(channel, 'channel_number', 'N/A')
-                                    channel_group = channel.channel_group.name.replace('"', '\\"').replace('\\', '\\\\') if channel.channel_group else "none"
-
-                                    logo_url = ""
-                                    if hasattr(channel, 'logo') and channel.logo:
-                                        logo_path = f"/api/channels/logos/{channel.logo.id}/cache/"
-                                        base_url = settings.get('base_url', '').strip()
-                                        if base_url:
-                                            logo_url = f"{base_url.rstrip('/')}{logo_path}"
-                                        else:
-                                            logo_url = logo_path
-                                    logo_url = logo_url.replace('"', '\\"').replace('\\', '\\\\')
-
-                                    metadata_key = f"{_CHANNEL_KEY_PREFIX}:channel:{channel_uuid}:metadata"
-                                    metadata = self.redis_client.hgetall(metadata_key) or {}
-
-                                    def get_metadata(field, default="0"):
-                                        val = metadata.get(field)
-                                        if val is None:
-                                            return default
-                                        return str(val)
-
-                                    active_stream_id_str = get_metadata(ChannelMetadataField.STREAM_ID, None)
-                                    if active_stream_id_str and active_stream_id_str != '0':
-                                        try:
-                                            stream_id = int(active_stream_id_str)
-                                        except (ValueError, TypeError):
-                                            logger.debug(f"Invalid active stream ID in metadata: {active_stream_id_str}")
+                                    profile = stream_profiles[int(stream_profile_id)]
+                                    stream_profile_name = escape_label(profile.name)
+                                except Exception:
+                                    stream_profile_name = f'Profile-{stream_profile_id}'
+                            else:
+                                try:
+                                    # The channel's own profile is already in the bulk-loaded
+                                    # table; only the default-profile fallback needs a query.
+                                    sp = stream_profiles.get(getattr(channel, 'stream_profile_id', None))
+                                    if sp is None:
+                                        sp = channel.get_stream_profile()
+                                    if sp:
+                                        stream_profile_name = escape_label(sp.name)
+                                except Exception:
+                                    pass
 
-                                    init_time = float(get_metadata(ChannelMetadataField.INIT_TIME, '0'))
-                                    uptime_seconds = int(time.time() - init_time) if init_time > 0 else 0
+                            video_codec = metadata.get(_F_VIDEO_CODEC, 'unknown')
+                            resolution = metadata.get(_F_RESOLUTION, 'unknown')
+                            source_fps = metadata.get(_F_SOURCE_FPS, '0')
+                            video_bitrate = metadata.get(_F_VIDEO_BITRATE, '0')
+                            ffmpeg_output_bitrate = metadata.get(_F_FFMPEG_OUTPUT_BITRATE, '0')
+                            ffmpeg_speed = metadata.get(_F_FFMPEG_SPEED, '0')
 
-                                    stream_profile_id = get_metadata(ChannelMetadataField.STREAM_PROFILE, '0')
-                                    stream_profile_name = 'Unknown'
-                                    if stream_profile_id and stream_profile_id != '0':
-                                        try:
-                                            from core.models import StreamProfile
-                                            profile = StreamProfile.objects.get(id=int(stream_profile_id))
-                                            stream_profile_name = profile.name.replace('"', '\\"').replace('\\', '\\\\')
-                                        except Exception:
-                                            stream_profile_name = f'Profile-{stream_profile_id}'
-                                    else:
-                                        try:
-                                            sp = channel.get_stream_profile()
-                                            if sp:
-                                                stream_profile_name = sp.name.replace('"', '\\"').replace('\\', '\\\\')
-                                        except Exception:
-                                            pass
+                            total_bytes = int(metadata.get(_F_TOTAL_BYTES, '0'))
+                            total_mb, avg_bitrate_bps = _transfer_stats(total_bytes, uptime_seconds)
 
-                                    video_codec = get_metadata(ChannelMetadataField.VIDEO_CODEC, 'unknown')
-                                    resolution = get_metadata(ChannelMetadataField.RESOLUTION, 'unknown')
-                                    source_fps = get_metadata(ChannelMetadataField.SOURCE_FPS, '0')
-                                    video_bitrate = get_metadata(ChannelMetadataField.VIDEO_BITRATE, '0')
-                                    ffmpeg_output_bitrate = get_metadata(ChannelMetadataField.FFMPEG_OUTPUT_BITRATE, '0')
-                                    ffmpeg_speed = get_metadata(ChannelMetadataField.FFMPEG_SPEED, '0')
+                            active_clients = len(entry['client_ids'])
+                            current_bitrate_bps = entry['current_bitrate_bps']
 
-                                    total_bytes = int(get_metadata(ChannelMetadataField.TOTAL_BYTES, '0'))
-                                    total_mb = round(total_bytes / 1024 / 1024, 2)
-                                    avg_bitrate_bps = round((total_bytes * 8 / uptime_seconds), 2) if uptime_seconds > 0 else 0
+                            state = metadata.get(_F_STATE, 'unknown')
 
-                                    client_set_key = f"{_CHANNEL_KEY_PREFIX}:channel:{channel_uuid}:clients"
-                                    active_clients = self.redis_client.scard(client_set_key) or 0
+                            stream_name = escape_label(stream.name)
+                            provider = escape_label(stream.m3u_account.name) if stream.m3u_account else "Unknown"
+                            stream_type = stream.m3u_account.account_type if stream.m3u_account else "Unknown"
 
-                                    current_bitrate_bps = 0.0
-                                    try:
-                                        client_ids = self.redis_client.smembers(client_set_key)
-                                        for client_id_bytes in client_ids:
-                                            try:
-                                                client_id = client_id_bytes.decode('utf-8') if isinstance(client_id_bytes, bytes) else client_id_bytes
-                                                client_key = f"{_CHANNEL_KEY_PREFIX}:channel:{channel_uuid}:clients:{client_id}"
-                                                client_data = self.redis_client.hgetall(client_key)
-                                                if client_data and 'current_rate_KBps' in client_data:
-                                                    current_rate_kb = float(client_data['current_rate_KBps'])
-                                                    if current_rate_kb > 50000:
-                                                        current_bitrate_bps += current_rate_kb * 8
-                                                    else:
-                                                        current_bitrate_bps += current_rate_kb * 8000
-                                            except Exception:
-                                                pass
-                                    except Exception:
-                                        pass
-
-                                    state = get_metadata(ChannelMetadataField.STATE, 'unknown')
+                            stream_index = stream_orders.get((channel.id, stream_id), 0)
 
-                                    try:
-                                        stream = Stream.objects.select_related('m3u_account').get(id=stream_id)
-                                        stream_name = stream.name.replace('"', '\\"').replace('\\', '\\\\')
-                                        provider = stream.m3u_account.name.replace('"', '\\"').replace('\\', '\\\\') if stream.m3u_account else "Unknown"
-                                        stream_type = stream.m3u_account.account_type if stream.m3u_account else "Unknown"
+                            profile_id = None
+                            profile_name = "Unknown"
+                            profile_connections = 0
+                            profile_max = 0
 
-                                        stream_index = 0
-                                        try:
-                                            from apps.channels.models import ChannelStream
-                                            channel_stream = ChannelStream.objects.get(channel_id=channel.id, stream_id=stream_id)
-                                            stream_index = channel_stream.order
-                                        except Exception:
-                                            pass
+                            m3u_profile_id = entry['m3u_profile_id']
+                            if m3u_profile_id and m3u_profile_id != '0':
+                                try:
+                                    profile_id = int(m3u_profile_id)
+                                    active_profile = m3u_profiles[profile_id]
+                                    profile_name = escape_label(active_profile.name)
+                                    profile_connections = entry['profile_connections']
+                                    profile_max = active_profile.max_streams
+                                except Exception as e:
+                                    logger.debug(f"Error getting M3U profile {profile_id}: {e}")
 
-                                        profile_id = None
-                                        profile_name = "Unknown"
-                                        profile_connections = 0
-                                        profile_max = 0
-
-                                        m3u_profile_id = get_metadata(ChannelMetadataField.M3U_PROFILE, None)
-                                        if not m3u_profile_id or m3u_profile_id == '0':
-                                            try:
-                                                raw = self.redis_client.get(f"stream_profile:{stream_id}")
-                                                if raw:
-                                                    m3u_profile_id = raw.decode('utf-8') if isinstance(raw, bytes) else str(raw)
-                                            except Exception:
-                                                pass
-                                        if m3u_profile_id and m3u_profile_id != '0':
-                                            try:
-                                                profile_id = int(m3u_profile_id)
-                                                active_profile = M3UAccountProfile.objects.get(id=profile_id)
-                                                profile_name = active_profile.name.replace('"', '\\"').replace('\\', '\\\\')
-                                                profile_connections = int(self.redis_client.get(f"profile_connections:{profile_id}") or 0)
-                                                profile_max = active_profile.max_streams
-                                            except Exception as e:
-                                                logger.debug(f"Error getting M3U profile {profile_id}: {e}")
-
-                                        base_labels = [
-                                            f'type="live"',
-                                            f'channel_uuid="{channel_uuid}"',
-                                            f'channel_number="{channel_number}"',
-                                        ]
-                                        base_labels_str = ",".join(base_labels)
+                            base_labels_str = f'type="live",channel_uuid="{channel_uuid}",channel_number="{channel_number}"'
+                            # Label block shared by this stream's value lines
+                            labels = f'{{{base_labels_str}}} '
 
-                                        try:
-                                            channel_number_value = float(channel_number)
-                                        except (ValueError, TypeError):
-                                            channel_number_value = 0.0
-
-                                        metadata_labels = base_labels + [
-                                            f'channel_name="{channel_name}"',
-                                            f'channel_group="{channel_group}"',
-                                            f'stream_id="{stream_id}"',
-                                            f'stream_name="{stream_name}"',
-                                            f'provider="{provider}"',
-                                            f'provider_type="{stream_type}"',
-                                            f'state="{state}"',
-                                            f'logo_url="{logo_url}"',
-                                            f'profile_id="{profile_id if profile_id else "none"}"',
-                                            f'profile_name="{profile_name}"',
-                                            f'stream_profile="{stream_profile_name}"',
-                                            f'video_codec="{video_codec}"',
-                                            f'resolution="{resolution}"',
+                            try:
+                                channel_number_value = float(channel_number)
+                            except (ValueError, TypeError):
+                                channel_number_value = 0.0
+
+                            stream_values.write(f'dispatcharr_stream_index{labels}{stream_index}\n')
+                            stream_values.write(f'dispatcharr_stream_available_streams{labels}{channel.available_streams}\n')
+                            stream_values.write(f'dispatcharr_stream_channel_number{labels}{channel_number_value}\n')
+                            stream_values.write(f'dispatcharr_stream_id{labels}{stream_id}\n')
+
+                            stream_values.write(f'dispatcharr_stream_uptime_seconds{labels}{uptime_seconds}\n')
+                            stream_values.write(f'dispatcharr_stream_active_clients{labels}{active_clients}\n')
+
+                            if source_fps and source_fps != '0':
+                                stream_values.write(f'dispatcharr_stream_fps{labels}{source_fps}\n')
+
+                            if ffmpeg_speed and ffmpeg_speed != '0':
+                                try:
+                                    speed_value = float(ffmpeg_speed.rstrip('x'))
+                                    stream_values.write(f'dispatcharr_stream_buffering_speed{labels}{speed_value}\n')
+                                except (ValueError, AttributeError):
+                                    pass
+
+                            if video_bitrate and video_bitrate != '0':
+                                stream_values.write(f'dispatcharr_stream_video_bitrate_bps{labels}{float(video_bitrate) * 1000}\n')
+                            if ffmpeg_output_bitrate and ffmpeg_output_bitrate != '0':
+                                stream_values.write(f'dispatcharr_stream_transcode_bitrate_bps{labels}{float(ffmpeg_output_bitrate) * 1000}\n')
+                            if avg_bitrate_bps > 0:
+                                stream_values.write(f'dispatcharr_stream_avg_bitrate_bps{labels}{avg_bitrate_bps}\n')
+                            if current_bitrate_bps > 0:
+                                stream_values.write(f'dispatcharr_stream_current_bitrate_bps{labels}{current_bitrate_bps}\n')
+                            if total_mb > 0:
+                                stream_values.write(f'dispatcharr_stream_total_transfer_mb{labels}{total_mb}\n')
+
+                            if profile_id:
+                                stream_values.write(f'dispatcharr_stream_profile_connections{labels}{profile_connections}\n')
+                                stream_values.write(f'dispatcharr_stream_profile_max_connections{labels}{profile_max}\n')
+
+                            stream_values.write(_LIVE_METADATA_TEMPLATE.format_map({
+                                'base_labels': base_labels_str,
+                                'channel_name': channel_name,
+                                'channel_group': channel_group,
+                                'stream_id': stream_id,
+                                'stream_name': stream_name,
+                                'provider': provider,
+                                'provider_type': stream_type,
+                                'state': state,
+                                'logo_url': logo_url,
+                                'profile_id': profile_id if profile_id else "none",
+                                'profile_name': profile_name,
+                                'stream_profile': stream_profile_name,
+                                'video_codec': video_codec,
+                                'resolution': resolution,
+                            }))
+
+                            # EPG program data.  Filtered on the foreign key id so the
+                            # channel's EPGData row is never loaded.
+                            epg_data_id = getattr(channel, 'epg_data_id', None)
+                            if epg_data_id:
+                                try:
+                                    now = django_timezone.now()
+
+                                    current_program = ProgramData.objects.filter(
+                                        epg_id=epg_data_id,
+                                        start_time__lte=now,
+                                        end_time__gte=now,
+                                    ).first()
+                                    previous_program = ProgramData.objects.filter(
+                                        epg_id=epg_data_id,
+                                        end_time__lt=now,
+                                    ).order_by('-end_time').first()
+                                    next_program = ProgramData.objects.filter(
+                                        epg_id=epg_data_id,
+                                        start_time__gt=now,
+                                    ).order_by('start_time').first()
+
+                                    def format_program_data(program, prefix):
+                                        if not program:
+                                            return [
+                                                f'{prefix}_title=""',
+                                                f'{prefix}_subtitle=""',
+                                                f'{prefix}_description=""',
+                                                f'{prefix}_start_time=""',
+                                                f'{prefix}_end_time=""',
+                                            ]
+
+                                        return [
+                                            f'{prefix}_title="{escape_label(program.title)}"',
+                                            f'{prefix}_subtitle="{escape_label(program.sub_title)}"',
+                                            f'{prefix}_description="{escape_label(program.description)}"',
+                                            f'{prefix}_start_time="{program.start_time.isoformat()}"',
+                                            f'{prefix}_end_time="{program.end_time.isoformat()}"',
                                         ]
 
-                                        stream_value_metrics.append(f'dispatcharr_stream_index{{{base_labels_str}}} {stream_index}')
-                                        stream_value_metrics.append(f'dispatcharr_stream_available_streams{{{base_labels_str}}} {channel.streams.count()}')
-                                        stream_value_metrics.append(f'dispatcharr_stream_channel_number{{{base_labels_str}}} {channel_number_value}')
-                                        stream_value_metrics.append(f'dispatcharr_stream_id{{{base_labels_str}}} {stream_id}')
-
-                                        stream_value_metrics.append(f'dispatcharr_stream_uptime_seconds{{{base_labels_str}}} {uptime_seconds}')
-                                        stream_value_metrics.append(f'dispatcharr_stream_active_clients{{{base_labels_str}}} {active_clients}')
-
-                                        if source_fps and source_fps != '0':
-                                            stream_value_metrics.append(f'dispatcharr_stream_fps{{{base_labels_str}}} {source_fps}')
-
-                                        if ffmpeg_speed and ffmpeg_speed != '0':
-                                            try:
-                                                speed_value = float(ffmpeg_speed.rstrip('x'))
-                                                stream_value_metrics.append(f'dispatcharr_stream_buffering_speed{{{base_labels_str}}} {speed_value}')
-                                            except (ValueError, AttributeError):
-                                                pass
-
-                                        if video_bitrate and video_bitrate != '0':
-                                            stream_value_metrics.append(f'dispatcharr_stream_video_bitrate_bps{{{base_labels_str}}} {float(video_bitrate) * 1000}')
-                                        if ffmpeg_output_bitrate and ffmpeg_output_bitrate != '0':
-                                            stream_value_metrics.append(f'dispatcharr_stream_transcode_bitrate_bps{{{base_labels_str}}} {float(ffmpeg_output_bitrate) * 1000}')
-                                        if avg_bitrate_bps > 0:
-                                            stream_value_metrics.append(f'dispatcharr_stream_avg_bitrate_bps{{{base_labels_str}}} {avg_bitrate_bps}')
-                                        if current_bitrate_bps > 0:
-                                            stream_value_metrics.append(f'dispatcharr_stream_current_bitrate_bps{{{base_labels_str}}} {current_bitrate_bps}')
-                                        if total_mb > 0:
-                                            stream_value_metrics.append(f'dispatcharr_stream_total_transfer_mb{{{base_labels_str}}} {total_mb}')
-
-                                        if profile_id:
-                                            stream_value_metrics.append(f'dispatcharr_stream_profile_connections{{{base_labels_str}}} {profile_connections}')
-                                            stream_value_metrics.append(f'dispatcharr_stream_profile_max_connections{{{base_labels_str}}} {profile_max}')
-
-                                        stream_value_metrics.append(f'dispatcharr_stream_metadata{{{",".join(metadata_labels)}}} 1')
-
-                                        # EPG program data
-                                        if hasattr(channel, 'epg_data') and channel.epg_data:
-                                            try:
-                                                from apps.epg.models import ProgramData
-                                                from django.utils import timezone as django_timezone
-
-                                                now = django_timezone.now()
-
-                                                current_program = ProgramData.objects.filter(
-                                                    epg=channel.epg_data,
-                                                    start_time__lte=now,
-                                                    end_time__gte=now,
-                                                ).first()
-                                                previous_program = ProgramData.objects.filter(
-                                                    epg=channel.epg_data,
-                                                    end_time__lt=now,
-                                                ).order_by('-end_time').first()
-                                                next_program = ProgramData.objects.filter(
-                                                    epg=channel.epg_data,
-                                                    start_time__gt=now,
-                                                ).order_by('start_time').first()
-
-                                                def format_program_data(program, prefix):
-                                                    if not program:
-                                                        return [
-                                                            f'{prefix}_title=""',
-                                                            f'{prefix}_subtitle=""',
-                                                            f'{prefix}_description=""',
-                                                            f'{prefix}_start_time=""',
-                                                            f'{prefix}_end_time=""',
-                                                        ]
-
-                                                    return [
-                                                        f'{prefix}_title="{escape_label(program.title)}"',
-                                                        f'{prefix}_subtitle="{escape_label(program.sub_title)}"',
-                                                        f'{prefix}_description="{escape_label(program.description)}"',
-                                                        f'{prefix}_start_time="{program.start_time.isoformat()}"',
-                                                        f'{prefix}_end_time="{program.end_time.isoformat()}"',
-                                                    ]
-
-                                                if previous_program or current_program or next_program:
-                                                    epg_labels = base_labels.copy()
-                                                    epg_labels.extend(format_program_data(previous_program, 'previous'))
-                                                    epg_labels.extend(format_program_data(current_program, 'current'))
-                                                    epg_labels.extend(format_program_data(next_program, 'next'))
-
-                                                    progress = 0.0
-                                                    if current_program:
-                                                        total_duration = (current_program.end_time - current_program.start_time).total_seconds()
-                                                        elapsed = (now - current_program.start_time).total_seconds()
-                                                        progress = min(1.0, max(0.0, elapsed / total_duration)) if total_duration > 0 else 0.0
-
-                                                    stream_value_metrics.append(f'dispatcharr_stream_programming{{{",".join(epg_labels)}}} {progress:.4f}')
-                                            except Exception as e:
-                                                logger.debug(f"Error fetching EPG program for channel {channel_id}: {e}")
-
-                                    except Stream.DoesNotExist:
-                                        logger.debug(f"Stream {stream_id} not found in database")
-
-                                except Channel.DoesNotExist:
-                                    logger.debug(f"Channel {channel_id} not found in database")
+                                    if previous_program or current_program or next_program:
+                                        epg_labels = [base_labels_str]
+                                        epg_labels.extend(format_program_data(previous_program, 'previous'))
+                                        epg_labels.extend(format_program_data(current_program, 'current'))
+                                        epg_labels.extend(format_program_data(next_program, 'next'))
+
+                                        progress = 0.0
+                                        if current_program:
+                                            total_duration = (current_program.end_time - current_program.start_time).total_seconds()
+                                            elapsed = (now - current_program.start_time).total_seconds()
+                                            progress = min(1.0, max(0.0, elapsed / total_duration)) if total_duration > 0 else 0.0
+
+                                        stream_values.write(f'dispatcharr_stream_programming{{{",".join(epg_labels)}}} {progress:.4f}\n')
+                                except Exception as e:
+                                    logger.debug(f"Error fetching EPG program for channel {channel_id}: {e}")
 
                         except Exception as e:
-                            logger.debug(f"Error processing stream key {key}: {e}")
+                            logger.debug(f"Error processing stream for channel {channel_id}: {e}")
 
                 except Exception as e:
                     logger.debug(f"Error scanning stream keys: {e}")
 
                 # ── VOD streams ──────────────────────────────────────────────
                 try:
-                    from apps.vod.models import Movie, Episode
-                    import re as _re
-
-                    for key in self.redis_client.scan_iter(match="vod_persistent_connection:*"):
+                    if Movie is None or Episode is None:
+                        # No VOD models on this build, so no VOD sessions to report
+                        vod_connections = []
+                    elif vod_connections is None:
+                        vod_connections = self._fetch_vod_connections()
+                    vod_profile_connections = self._fetch_profile_connections(
+                        connection_data.get('m3u_profile_id') for _session_id, connection_data in vod_connections
+                    )
+                    m3u_profiles = self._get_m3u_profiles()
+                    # Escaped (profile_name, provider_name) per profile id, so
+                    # sessions sharing a profile escape its labels once
+                    vod_profile_labels = {}
+                    for session_id, connection_data in vod_connections:
                         try:
-                            connection_data = self.redis_client.hgetall(key)
-                            if not connection_data:
-                                continue
-
-                            if isinstance(list(connection_data.keys())[0], bytes):
-                                def get_vod_field(field_name, default=''):
-                                    val = connection_data.get(
-                                        field_name.encode('utf-8') if isinstance(field_name, str) else field_name,
-                                        b'',
-                                    )
-                                    return val.decode('utf-8') if isinstance(val, bytes) else default
-                            else:
-                                def get_vod_field(field_name, default=''):
-                                    return connection_data.get(field_name, default)
+                            get_vod_field = connection_data.get
 
                             active_stream_count = int(get_vod_field('active_streams', '0'))
                             if active_stream_count == 0:
@@ -681,9 +1081,6 @@ class PrometheusMetricsCollector:
                             active_streams += 1
                             active_vod_streams += 1
 
-                            session_id = key.decode('utf-8') if isinstance(key, bytes) else key
-                            session_id = session_id.replace('vod_persistent_connection:', '')
-
                             try:
                                 session_parts = session_id.split('_')
                                 vod_channel_number = session_parts[1] if len(session_parts) >= 2 else session_id
@@ -713,13 +1110,9 @@ class PrometheusMetricsCollector:
 
                             try:
                                 if content_type == 'movie':
-                                    from apps.vod.models import M3UMovieRelation
                                     content_obj = Movie.objects.select_related('logo').get(uuid=content_uuid)
                                     if hasattr(content_obj, 'logo') and content_obj.logo:
-                                        logo_url = f"/api/vod/vodlogos/{content_obj.logo.id}/cache/"
-                                        base_url = settings.get('base_url', '').strip() if settings else ''
-                                        if base_url:
-                                            logo_url = f"{base_url.rstrip('/')}{logo_url}"
+                                        logo_url = f"{logo_base_url}/api/vod/vodlogos/{content_obj.logo.id}/cache/"
                                     if content_obj.custom_properties:
                                         video_info = content_obj.custom_properties.get('video', {})
                                         if video_info:
@@ -752,23 +1145,19 @@ class PrometheusMetricsCollector:
                                                 m3u_account__profiles__id=int(m3u_profile_id_str),
                                             ).first()
                                             if relation and relation.category:
-                                                channel_group = relation.category.name.replace('"', '\\"').replace('\\', '\\\\')
+                                                channel_group = escape_label(relation.category.name)
                                         except Exception:
                                             pass
 
                                 elif content_type == 'episode':
-                                    from apps.vod.models import M3USeriesRelation
                                     content_obj = Episode.objects.select_related('series', 'series__logo').get(uuid=content_uuid)
                                     season_number = content_obj.season_number
                                     episode_number = content_obj.episode_number
                                     if content_obj.series:
                                         content_name = content_obj.series.name
-                                        series_name = content_obj.series.name.replace('"', '\\"').replace('\\', '\\\\')
+                                        series_name = escape_label(content_obj.series.name)
                                     if hasattr(content_obj.series, 'logo') and content_obj.series.logo:
-                                        logo_url = f"/api/vod/vodlogos/{content_obj.series.logo.id}/cache/"
-                                        base_url = settings.get('base_url', '').strip() if settings else ''
-                                        if base_url:
-                                            logo_url = f"{base_url.rstrip('/')}{logo_url}"
+                                        logo_url = f"{logo_base_url}/api/vod/vodlogos/{content_obj.series.logo.id}/cache/"
                                     if content_obj.custom_properties:
                                         video_info = content_obj.custom_properties.get('video', {})
                                         if video_info:
@@ -785,12 +1174,15 @@ class PrometheusMetricsCollector:
                                         prog_subtitle = prog_subtitle[len(prog_title):].lstrip(' -')
                                     series_name_no_year = prog_title
                                     if prog_title:
-                                        match = _re.search(r'\s*\(\d{4}\)$', prog_title)
+                                        match = _YEAR_SUFFIX_RE.search(prog_title)
                                         if match:
                                             series_name_no_year = prog_title[:match.start()].strip()
                                     if series_name_no_year and prog_subtitle.startswith(series_name_no_year):
                                         prog_subtitle = prog_subtitle[len(series_name_no_year):].lstrip(' -')
-                                    logger.debug(f"VOD Episode programming: title='{prog_title}', subtitle='{prog_subtitle}', duration={prog_duration_secs}")
+                                    logger.debug(
+                                        "VOD Episode programming: title='%s', subtitle='%s', duration=%s",
+                                        prog_title, prog_subtitle, prog_duration_secs,
+                                    )
                                     if m3u_profile_id_str and content_obj.series:
                                         try:
                                             relation = M3USeriesRelation.objects.select_related('category').filter(
@@ -798,7 +1190,7 @@ class PrometheusMetricsCollector:
                                                 m3u_account__profiles__id=int(m3u_profile_id_str),
                                             ).first()
                                             if relation and relation.category:
-                                                channel_group = relation.category.name.replace('"', '\\"').replace('\\', '\\\\')
+                                                channel_group = escape_label(relation.category.name)
                                         except Exception:
                                             pass
 
@@ -807,8 +1199,8 @@ class PrometheusMetricsCollector:
                             except Exception as e:
                                 logger.error(f"Error querying VOD content metadata for {content_uuid}: {e}", exc_info=True)
 
-                            content_name = content_name.replace('"', '\\"').replace('\\', '\\\\')
-                            logo_url = logo_url.replace('"', '\\"').replace('\\', '\\\\')
+                            content_name = escape_label(content_name)
+                            logo_url = escape_label(logo_url)
 
                             profile_id = None
                             profile_name = ""
@@ -820,11 +1212,16 @@ class PrometheusMetricsCollector:
                             if m3u_profile_id_str:
                                 try:
                                     profile_id = int(m3u_profile_id_str)
-                                    active_profile = M3UAccountProfile.objects.get(id=profile_id)
-                                    profile_name = active_profile.name.replace('"', '\\"').replace('\\', '\\\\')
-                                    provider_name = active_profile.m3u_account.name.replace('"', '\\"').replace('\\', '\\\\')
+                                    active_profile = m3u_profiles[profile_id]
+                                    escaped = vod_profile_labels.get(profile_id)
+                                    if escaped is None:
+                                        escaped = vod_profile_labels[profile_id] = (
+                                            escape_label(active_profile.name),
+                                            escape_label(active_profile.m3u_account.name),
+                                        )
+                                    profile_name, provider_name = escaped
                                     provider_type = active_profile.m3u_account.account_type
-                                    profile_connections = int(self.redis_client.get(f"profile_connections:{profile_id}") or 0)
+                                    profile_connections = vod_profile_connections.get(profile_id, 0)
                                     profile_max = active_profile.max_streams
                                 except Exception as e:
                                     logger.debug(f"Error getting VOD M3U profile {m3u_profile_id_str}: {e}")
@@ -832,60 +1229,55 @@ class PrometheusMetricsCollector:
                             created_at = float(get_vod_field('created_at', '0'))
                             uptime_seconds = int(time.time() - created_at) if created_at > 0 else 0
                             bytes_sent = int(get_vod_field('bytes_sent', '0'))
-                            total_mb = round(bytes_sent / 1024 / 1024, 2)
-                            avg_bitrate_bps = round((bytes_sent * 8 / uptime_seconds), 2) if uptime_seconds > 0 else 0
+                            total_mb, avg_bitrate_bps = _transfer_stats(bytes_sent, uptime_seconds)
                             active_clients = active_stream_count
 
-                            base_labels = [
-                                f'type="vod"',
-                                f'channel_uuid="{session_id}"',
-                                f'channel_number="{vod_channel_number}"',
-                            ]
-                            base_labels_str = ",".join(base_labels)
-
-                            metadata_labels = base_labels + [
-                                f'content_uuid="{content_uuid}"',
-                                f'channel_name="{content_name}"',
-                                f'channel_group="{channel_group}"',
-                                f'content_type="{content_type}"',
-                                f'provider="{provider_name}"',
-                                f'provider_type="{provider_type}"',
-                                f'state="active"',
-                                f'logo_url="{logo_url}"',
-                                f'profile_id="{profile_id if profile_id else "none"}"',
-                                f'profile_name="{profile_name}"',
-                                f'stream_profile="{stream_profile_name}"',
-                                f'video_codec="{video_codec}"',
-                                f'resolution="{resolution}"',
-                            ]
+                            base_labels_str = f'type="vod",channel_uuid="{session_id}",channel_number="{vod_channel_number}"'
+                            # Label block shared by this stream's value lines
+                            labels = f'{{{base_labels_str}}} '
 
+                            episode_labels = ""
                             if content_type == 'episode' and season_number is not None and episode_number is not None:
-                                metadata_labels.append(f'season_number="{season_number}"')
-                                metadata_labels.append(f'episode_number="{episode_number}"')
+                                episode_labels = f',season_number="{season_number}",episode_number="{episode_number}"'
                                 if series_name:
-                                    metadata_labels.append(f'series_name="{series_name}"')
-
-                            stream_value_metrics.append(f'dispatcharr_stream_id{{{base_labels_str}}} 0')
-                            stream_value_metrics.append(f'dispatcharr_stream_metadata{{{",".join(metadata_labels)}}} 1')
-                            stream_value_metrics.append(f'dispatcharr_stream_uptime_seconds{{{base_labels_str}}} {uptime_seconds}')
-                            stream_value_metrics.append(f'dispatcharr_stream_active_clients{{{base_labels_str}}} {active_clients}')
+                                    episode_labels += f',series_name="{series_name}"'
+
+                            stream_values.write(f'dispatcharr_stream_id{labels}0\n')
+                            stream_values.write(_VOD_METADATA_TEMPLATE.format_map({
+                                'base_labels': base_labels_str,
+                                'content_uuid': content_uuid,
+                                'channel_name': content_name,
+                                'channel_group': channel_group,
+                                'content_type': content_type,
+                                'provider': provider_name,
+                                'provider_type': provider_type,
+                                'logo_url': logo_url,
+                                'profile_id': profile_id if profile_id else "none",
+                                'profile_name': profile_name,
+                                'stream_profile': stream_profile_name,
+                                'video_codec': video_codec,
+                                'resolution': resolution,
+                                'episode_labels': episode_labels,
+                            }))
+                            stream_values.write(f'dispatcharr_stream_uptime_seconds{labels}{uptime_seconds}\n')
+                            stream_values.write(f'dispatcharr_stream_active_clients{labels}{active_clients}\n')
 
                             if avg_bitrate_bps > 0:
-                                stream_value_metrics.append(f'dispatcharr_stream_avg_bitrate_bps{{{base_labels_str}}} {avg_bitrate_bps}')
+                                stream_values.write(f'dispatcharr_stream_avg_bitrate_bps{labels}{avg_bitrate_bps}\n')
                             if total_mb > 0:
-                                stream_value_metrics.append(f'dispatcharr_stream_total_transfer_mb{{{base_labels_str}}} {total_mb}')
+                                stream_values.write(f'dispatcharr_stream_total_transfer_mb{labels}{total_mb}\n')
                             if profile_id:
-                                stream_value_metrics.append(f'dispatcharr_stream_profile_connections{{{base_labels_str}}} {profile_connections}')
-                                stream_value_metrics.append(f'dispatcharr_stream_profile_max_connections{{{base_labels_str}}} {profile_max}')
-
-                            # VOD programming metric
-                            logger.debug(f"VOD Programming check for {session_id}: prog_title='{prog_title}', prog_description='{prog_description[:50] if prog_description else ''}'")
+                                stream_values.write(f'dispatcharr_stream_profile_connections{labels}{profile_connections}\n')
+                                stream_values.write(f'dispatcharr_stream_profile_max_connections{labels}{profile_max}\n')
+
+                            # VOD programming metric.  Logged lazily: this runs for
+                            # every VOD session on every scrape.
+                            logger.debug(
+                                "VOD Programming check for %s: prog_title='%s', prog_description='%.50s'",
+                                session_id, prog_title, prog_description or '',
+                            )
                             if prog_title or prog_description:
                                 try:
-                                    from datetime import datetime, timezone, timedelta
-
-                                    logger.debug(f"Entering programming metric generation for {session_id}")
-
                                     prog_title_safe = escape_label(prog_title)
                                     prog_subtitle_safe = escape_label(prog_subtitle)
                                     prog_description_safe = escape_label(prog_description)
@@ -898,7 +1290,8 @@ class PrometheusMetricsCollector:
                                         if prog_duration_secs > 0:
                                             prog_end_time = (start_dt + timedelta(seconds=prog_duration_secs)).isoformat()
 
-                                    programming_labels = base_labels + [
+                                    programming_labels = [
+                                        base_labels_str,
                                         'previous_title=""',
                                         'previous_subtitle=""',
                                         'previous_description=""',
@@ -920,111 +1313,92 @@ class PrometheusMetricsCollector:
                                     if prog_duration_secs > 0 and uptime_seconds > 0:
                                         progress = min(1.0, max(0.0, uptime_seconds / prog_duration_secs))
 
-                                    programming_metric = f'dispatcharr_stream_programming{{{",".join(programming_labels)}}} {progress:.4f}'
-                                    stream_value_metrics.append(programming_metric)
-                                    logger.debug(f"Programming metric appended for {session_id}")
+                                    programming_metric = f'dispatcharr_stream_programming{{{",".join(programming_labels)}}} {progress:.4f}\n'
+                                    stream_values.write(programming_metric)
                                 except Exception as prog_e:
                                     logger.error(f"Error generating programming metric for {session_id}: {prog_e}", exc_info=True)
 
                         except Exception as e:
-                            logger.debug(f"Error processing VOD connection key {key}: {e}")
+                            logger.debug(f"Error processing VOD connection {session_id}: {e}")
 
                 except Exception as e:
                     logger.debug(f"Error scanning VOD connection keys: {e}")
 
                 # Emit totals and collected metrics
-                metrics.append(f"dispatcharr_active_streams {active_streams}")
-                metrics.append(f'dispatcharr_active_streams{{type="live"}} {active_live_streams}')
-                metrics.append(f'dispatcharr_active_streams{{type="vod"}} {active_vod_streams}')
-                for metric in stream_value_metrics:
-                    metrics.append(metric)
+                write(f"dispatcharr_active_streams {active_streams}\n")
+                write(f'dispatcharr_active_streams{{type="live"}} {active_live_streams}\n')
+                write(f'dispatcharr_active_streams{{type="vod"}} {active_vod_streams}\n')
+                write(stream_values.getvalue())
 
         except Exception as e:
             logger.error(f"Error collecting stream metrics: {e}")
 
-        metrics.append("")
-        return metrics
+        write("\n")
 
     # ── EPG metrics ──────────────────────────────────────────────────────────
 
-    def _collect_epg_metrics(self, settings: dict = None) -> list:
+    def _collect_epg_metrics(self, out, settings: dict = None) -> None:
         """Collect EPG source statistics."""
-        from apps.epg.models import EPGSource
-
-        metrics = []
+        write = out.write
         include_urls = settings and settings.get('include_source_urls', False)
 
         try:
-            total_sources = EPGSource.objects.exclude(source_type='dummy').count()
-            active_sources = EPGSource.objects.filter(is_active=True).exclude(source_type='dummy').count()
-
-            metrics.append("# HELP dispatcharr_epg_sources Total number of EPG sources")
-            metrics.append("# TYPE dispatcharr_epg_sources gauge")
-            metrics.append(f'dispatcharr_epg_sources{{status="total"}} {total_sources}')
-            metrics.append(f'dispatcharr_epg_sources{{status="active"}} {active_sources}')
-
-            metrics.append("# HELP dispatcharr_epg_source_status EPG source status breakdown")
-            metrics.append("# TYPE dispatcharr_epg_source_status gauge")
-            for status_choice in EPGSource.STATUS_CHOICES:
-                status_value = status_choice[0]
-                count = EPGSource.objects.filter(status=status_value).exclude(source_type='dummy').count()
-                metrics.append(f'dispatcharr_epg_source_status{{status="{status_value}"}} {count}')
-
-            metrics.append("# HELP dispatcharr_epg_source_priority Priority value for EPG source (lower is higher priority)")
-            metrics.append("# TYPE dispatcharr_epg_source_priority gauge")
-
-            for source in EPGSource.objects.exclude(source_type='dummy'):
-                source_name = source.name.replace('"', '\\"').replace('\\', '\\\\')
-                source_type = source.source_type or 'unknown'
-                status = source.status
-                is_active = str(source.is_active).lower()
-                priority = source.priority
+            all_sources = EPGSource.objects.exclude(source_type='dummy')
+
+            # Totals and the per-status breakdown in a single aggregate query
+            stats = all_sources.aggregate(**_EPG_SOURCE_AGGREGATES)
+
+            write(_EPG_SOURCES_HEADER)
+            write(f'dispatcharr_epg_sources{{status="total"}} {stats["total"]}\n')
+            write(f'dispatcharr_epg_sources{{status="active"}} {stats["active"]}\n')
+
+            write(_EPG_SOURCE_STATUS_HEADER)
+            for i, status_value in enumerate(_EPG_STATUS_VALUES):
+                write(f'dispatcharr_epg_source_status{{status="{status_value}"}} {stats[f"status_{i}"]}\n')
+
+            write(_EPG_SOURCE_PRIORITY_HEADER)
+
+            source_rows = all_sources.values(
+                'id', 'name', 'source_type', 'status', 'is_active', 'priority', 'url',
+            )
+            for source in source_rows.iterator():
+                source_name = escape_label(source['name'])
+                source_type = source['source_type'] or 'unknown'
+                status = source['status']
+                is_active = str(source['is_active']).lower()
+                priority = source['priority']
 
                 base_labels = [
-                    f'source_id="{source.id}"',
+                    f'source_id="{source["id"]}"',
                     f'source_name="{source_name}"',
                     f'source_type="{source_type}"',
                     f'status="{status}"',
                     f'is_active="{is_active}"',
                 ]
-                if include_urls and source.url:
-                    source_url = source.url.replace('"', '\\"').replace('\\', '\\\\')
+                if include_urls and source['url']:
+                    source_url = escape_label(source['url'])
                     base_labels.append(f'url="{source_url}"')
 
-                metrics.append(f'dispatcharr_epg_source_priority{{{",".join(base_labels)}}} {priority}')
+                write(f'dispatcharr_epg_source_priority{{{",".join(base_labels)}}} {priority}\n')
 
         except Exception as e:
             logger.error(f"Error collecting EPG metrics: {e}")
 
-        metrics.append("")
-        return metrics
+        write("\n")
 
     # ── Client metrics ───────────────────────────────────────────────────────
 
-    def _collect_client_metrics(self) -> list:
+    def _collect_client_metrics(self, out, vod_connections: list = None) -> None:
         """Collect individual client connection metrics."""
-        metrics = []
+        write = out.write
 
         try:
-            from apps.channels.models import Channel
-
-            metrics.append("# HELP dispatcharr_active_clients Total number of active client connections (live and VOD)")
-            metrics.append("# TYPE dispatcharr_active_clients gauge")
-            metrics.append("# HELP dispatcharr_client_info Client connection metadata (type: live/vod)")
-            metrics.append("# TYPE dispatcharr_client_info gauge")
-            metrics.append("# HELP dispatcharr_client_connection_duration_seconds Duration of client connection in seconds")
-            metrics.append("# TYPE dispatcharr_client_connection_duration_seconds gauge")
-            metrics.append("# HELP dispatcharr_client_bytes_sent Total bytes sent to client")
-            metrics.append("# TYPE dispatcharr_client_bytes_sent counter")
-            metrics.append("# HELP dispatcharr_client_avg_transfer_rate_bps Average transfer rate to client in bits per second")
-            metrics.append("# TYPE dispatcharr_client_avg_transfer_rate_bps gauge")
-            metrics.append("# HELP dispatcharr_client_current_transfer_rate_bps Current transfer rate to client in bits per second")
-            metrics.append("# TYPE dispatcharr_client_current_transfer_rate_bps gauge")
+            write(_CLIENT_HEADERS)
 
             cursor = 0
             current_time = time.time()
             total_clients = 0
-            client_metrics = []
+            client_values = io.StringIO()
 
             _user_cache = {}  # per-scrape cache: user_id int -> username str
 
@@ -1034,254 +1408,209 @@ class PrometheusMetricsCollector:
                     if uid <= 0:
                         return 'anonymous'
                     if uid not in _user_cache:
-                        from apps.accounts.models import User
                         _user_cache[uid] = User.objects.get(id=uid).username
                     return _user_cache[uid]
                 except Exception:
                     return 'anonymous'
 
-            # Live clients
+            # Live clients: collect every client set key, then read the sets
+            # and the client hashes with one pipeline each
+            client_sets = []
             while True:
                 cursor, keys = self.redis_client.scan(
                     cursor,
                     match=f"{_CHANNEL_KEY_PREFIX}:channel:*:clients",
-                    count=100,
+                    count=_SCAN_COUNT,
                 )
                 for client_set_key in keys:
-                    try:
-                        parts = client_set_key.decode('utf-8') if isinstance(client_set_key, bytes) else client_set_key
-                        parts = parts.split(':')
-                        if len(parts) < 4:
-                            continue
-                        channel_uuid = parts[2]
-
-                        try:
-                            channel = Channel.objects.get(uuid=channel_uuid)
-                            channel_number = getattr(channel, 'channel_number', 'N/A')
-                        except Channel.DoesNotExist:
-                            continue
-
-                        client_ids = self.redis_client.smembers(client_set_key)
-                        total_clients += len(client_ids)
-
-                        for client_id_bytes in client_ids:
-                            try:
-                                client_id = client_id_bytes.decode('utf-8') if isinstance(client_id_bytes, bytes) else client_id_bytes
-                                client_key = f"{_CHANNEL_KEY_PREFIX}:channel:{channel_uuid}:clients:{client_id}"
-                                client_data = self.redis_client.hgetall(client_key)
-
-                                if not client_data:
-                                    continue
-
-                                def get_client_field(field, default='unknown'):
-                                    val = client_data.get(field)
-                                    if val is None:
-                                        return default
-                                    return str(val)
-
-                                ip_address = get_client_field('ip_address', 'unknown')
-                                user_agent = get_client_field('user_agent', 'unknown')
-                                worker_id = get_client_field('worker_id', 'unknown')
-                                user_id_str = get_client_field('user_id', '0')
-                                username = _resolve_username(user_id_str)
-
-                                ip_address_safe = ip_address.replace('"', '\\"').replace('\\', '\\\\')
-                                user_agent_safe = user_agent.replace('"', '\\"').replace('\\', '\\\\').replace('\n', ' ').replace('\r', '')
-                                client_id_safe = client_id.replace('"', '\\"').replace('\\', '\\\\')
-                                worker_id_safe = worker_id.replace('"', '\\"').replace('\\', '\\\\')
-                                username_safe = username.replace('"', '\\"').replace('\\', '\\\\')
-
-                                connection_duration = 0
-                                try:
-                                    connected_at = float(get_client_field('connected_at', '0'))
-                                    if connected_at > 0:
-                                        connection_duration = max(0, int(current_time - connected_at))
-                                except (ValueError, TypeError):
-                                    pass
-
-                                bytes_sent = 0
-                                try:
-                                    bytes_sent = int(get_client_field('bytes_sent', '0'))
-                                except (ValueError, TypeError):
-                                    pass
-
-                                avg_rate_bps = 0.0
-                                try:
-                                    avg_rate_value = float(get_client_field('avg_rate_KBps', '0'))
-                                    avg_rate_bps = avg_rate_value * 8 if avg_rate_value > 50000 else avg_rate_value * 8000
-                                except (ValueError, TypeError):
-                                    pass
-
-                                current_rate_bps = 0.0
-                                try:
-                                    current_rate_value = float(get_client_field('current_rate_KBps', '0'))
-                                    current_rate_bps = current_rate_value * 8 if current_rate_value > 50000 else current_rate_value * 8000
-                                except (ValueError, TypeError):
-                                    pass
-
-                                base_labels = [
-                                    f'type="live"',
-                                    f'client_id="{client_id_safe}"',
-                                    f'channel_uuid="{channel_uuid}"',
-                                    f'channel_number="{channel_number}"',
-                                ]
-                                base_labels_str = ','.join(base_labels)
-
-                                info_labels = base_labels + [
-                                    f'ip_address="{ip_address_safe}"',
-                                    f'user_agent="{user_agent_safe}"',
-                                    f'worker_id="{worker_id_safe}"',
-                                    f'user_id="{user_id_str}"',
-                                    f'username="{username_safe}"',
-                                ]
-                                client_metrics.append(f'dispatcharr_client_info{{{",".join(info_labels)}}} 1')
-
-                                if connection_duration > 0:
-                                    client_metrics.append(f'dispatcharr_client_connection_duration_seconds{{{base_labels_str}}} {connection_duration}')
-                                if bytes_sent > 0:
-                                    client_metrics.append(f'dispatcharr_client_bytes_sent{{{base_labels_str}}} {bytes_sent}')
-                                if avg_rate_bps > 0:
-                                    client_metrics.append(f'dispatcharr_client_avg_transfer_rate_bps{{{base_labels_str}}} {avg_rate_bps}')
-                                if current_rate_bps > 0:
-                                    client_metrics.append(f'dispatcharr_client_current_transfer_rate_bps{{{base_labels_str}}} {current_rate_bps}')
-
-                            except Exception as e:
-                                logger.debug(f"Error processing client {client_id}: {e}")
-
-                    except Exception as e:
-                        logger.debug(f"Error processing client set {client_set_key}: {e}")
-
+                    parts = client_set_key.split(':')
+                    if len(parts) >= 4:
+                        client_sets.append((client_set_key, parts[2]))
                 if cursor == 0:
                     break
 
-            # VOD clients
-            try:
-                cursor = 0
-                while True:
-                    cursor, keys = self.redis_client.scan(
-                        cursor,
-                        match="vod_persistent_connection:*",
-                        count=100,
-                    )
-                    for key in keys:
-                        try:
-                            connection_data = self.redis_client.hgetall(key)
-                            if not connection_data:
-                                continue
+            client_id_sets = [
+                client_ids or ()
+                for client_ids in self._pipeline(('smembers', key) for key, _channel_uuid in client_sets)
+            ]
+            client_hashes = iter([
+                {field: value for field, value in zip(_CLIENT_FIELDS, values or ()) if value is not None}
+                for values in self._pipeline(
+                    ('hmget', f"{_CHANNEL_KEY_PREFIX}:channel:{channel_uuid}:clients:{client_id}", *_CLIENT_FIELDS)
+                    for (_key, channel_uuid), client_ids in zip(client_sets, client_id_sets)
+                    for client_id in client_ids
+                )
+            ])
+
+            # Channel numbers for every channel with clients, in one query
+            channel_numbers = {
+                str(channel_uuid): channel_number
+                for channel_uuid, channel_number in Channel.objects.filter(
+                    uuid__in=[channel_uuid for _key, channel_uuid in client_sets],
+                ).values_list('uuid', 'channel_number')
+            } if client_sets else {}
+
+            for (client_set_key, channel_uuid), client_ids in zip(client_sets, client_id_sets):
+                client_rows = [(client_id, next(client_hashes)) for client_id in client_ids]
+                try:
+                    if channel_uuid not in channel_numbers:
+                        continue
+                    channel_number = channel_numbers[channel_uuid]
 
-                            if isinstance(list(connection_data.keys())[0], bytes):
-                                def get_vod_field(field_name, default=''):
-                                    val = connection_data.get(
-                                        field_name.encode('utf-8') if isinstance(field_name, str) else field_name,
-                                        b'',
-                                    )
-                                    return val.decode('utf-8') if isinstance(val, bytes) else default
-                            else:
-                                def get_vod_field(field_name, default=''):
-                                    return connection_data.get(field_name, default)
+                    total_clients += len(client_ids)
 
-                            active_stream_count = int(get_vod_field('active_streams', '0'))
-                            if active_stream_count == 0:
+                    for client_id, client_data in client_rows:
+                        try:
+                            if not client_data:
                                 continue
 
-                            total_clients += 1
-
-                            session_id = key.decode('utf-8') if isinstance(key, bytes) else key
-                            session_id = session_id.replace('vod_persistent_connection:', '')
-
-                            try:
-                                session_parts = session_id.split('_')
-                                vod_channel_number = session_parts[1] if len(session_parts) >= 2 else session_id
-                            except Exception:
-                                vod_channel_number = session_id
-
-                            content_type = get_vod_field('content_obj_type', 'unknown')
-                            content_uuid = get_vod_field('content_uuid', '')
-                            content_name = get_vod_field('content_name', 'Unknown')
-                            client_ip = get_vod_field('client_ip', 'unknown')
-                            client_user_agent = get_vod_field('client_user_agent', 'unknown')
-                            worker_id = get_vod_field('worker_id', 'unknown')
-                            user_id_str = get_vod_field('user_id', '0')
+                            ip_address = client_data.get('ip_address', 'unknown')
+                            user_agent = client_data.get('user_agent', 'unknown')
+                            worker_id = client_data.get('worker_id', 'unknown')
+                            user_id_str = client_data.get('user_id', '0')
                             username = _resolve_username(user_id_str)
 
-                            session_id_safe = session_id.replace('"', '\\"').replace('\\', '\\\\')
-                            vod_channel_number_safe = vod_channel_number.replace('"', '\\"').replace('\\', '\\\\')
-                            content_name_safe = content_name.replace('"', '\\"').replace('\\', '\\\\')
-                            client_ip_safe = client_ip.replace('"', '\\"').replace('\\', '\\\\')
-                            client_user_agent_safe = client_user_agent.replace('"', '\\"').replace('\\', '\\\\').replace('\n', ' ').replace('\r', '')
-                            worker_id_safe = worker_id.replace('"', '\\"').replace('\\', '\\\\')
-                            username_safe = username.replace('"', '\\"').replace('\\', '\\\\')
+                            ip_address_safe = escape_label(ip_address)
+                            user_agent_safe = _escape_user_agent(user_agent)
+                            client_id_safe = escape_label(client_id)
+                            worker_id_safe = escape_label(worker_id)
+                            username_safe = escape_label(username)
 
                             connection_duration = 0
-                            created_at = float(get_vod_field('created_at', '0'))
-                            if created_at > 0:
-                                connection_duration = int(current_time - created_at)
+                            connected_at = _safe_float(client_data.get('connected_at'))
+                            if connected_at > 0:
+                                connection_duration = max(0, int(current_time - connected_at))
 
-                            bytes_sent = int(get_vod_field('bytes_sent', '0'))
-                            avg_rate_bps = 0.0
-                            if connection_duration > 0 and bytes_sent > 0:
-                                avg_rate_bps = round((bytes_sent * 8 / connection_duration), 2)
+                            bytes_sent = _safe_int(client_data.get('bytes_sent'))
+                            avg_rate_bps = _rate_to_bps(_safe_float(client_data.get('avg_rate_KBps')))
+                            current_rate_bps = _rate_to_bps(_safe_float(client_data.get('current_rate_KBps')))
 
-                            client_id_safe = session_id_safe
                             base_labels = [
-                                f'type="vod"',
+                                f'type="live"',
                                 f'client_id="{client_id_safe}"',
-                                f'channel_uuid="{session_id_safe}"',
-                                f'channel_number="{vod_channel_number_safe}"',
+                                f'channel_uuid="{channel_uuid}"',
+                                f'channel_number="{channel_number}"',
                             ]
                             base_labels_str = ','.join(base_labels)
 
                             info_labels = base_labels + [
-                                f'content_uuid="{content_uuid}"',
-                                f'channel_name="{content_name_safe}"',
-                                f'content_type="{content_type}"',
-                                f'ip_address="{client_ip_safe}"',
-                                f'user_agent="{client_user_agent_safe}"',
+                                f'ip_address="{ip_address_safe}"',
+                                f'user_agent="{user_agent_safe}"',
                                 f'worker_id="{worker_id_safe}"',
                                 f'user_id="{user_id_str}"',
                                 f'username="{username_safe}"',
                             ]
-                            client_metrics.append(f'dispatcharr_client_info{{{",".join(info_labels)}}} 1')
+                            client_values.write(f'dispatcharr_client_info{{{",".join(info_labels)}}} 1\n')
 
                             if connection_duration > 0:
-                                client_metrics.append(f'dispatcharr_client_connection_duration_seconds{{{base_labels_str}}} {connection_duration}')
+                                client_values.write(f'dispatcharr_client_connection_duration_seconds{{{base_labels_str}}} {connection_duration}\n')
                             if bytes_sent > 0:
-                                client_metrics.append(f'dispatcharr_client_bytes_sent{{{base_labels_str}}} {bytes_sent}')
+                                client_values.write(f'dispatcharr_client_bytes_sent{{{base_labels_str}}} {bytes_sent}\n')
                             if avg_rate_bps > 0:
-                                client_metrics.append(f'dispatcharr_client_avg_transfer_rate_bps{{{base_labels_str}}} {avg_rate_bps:.2f}')
-                                client_metrics.append(f'dispatcharr_client_current_transfer_rate_bps{{{base_labels_str}}} {avg_rate_bps:.2f}')
+                                client_values.write(f'dispatcharr_client_avg_transfer_rate_bps{{{base_labels_str}}} {avg_rate_bps}\n')
+                            if current_rate_bps > 0:
+                                client_values.write(f'dispatcharr_client_current_transfer_rate_bps{{{base_labels_str}}} {current_rate_bps}\n')
 
                         except Exception as e:
-                            logger.debug(f"Error processing VOD connection for clients: {e}")
+                            logger.debug(f"Error processing client {client_id}: {e}")
+
+                except Exception as e:
+                    logger.debug(f"Error processing client set {client_set_key}: {e}")
 
-                    if cursor == 0:
-                        break
+            # VOD clients
+            try:
+                if vod_connections is None:
+                    vod_connections = self._fetch_vod_connections()
+                for session_id, connection_data in vod_connections:
+                    try:
+                        get_vod_field = connection_data.get
+
+                        active_stream_count = int(get_vod_field('active_streams', '0'))
+                        if active_stream_count == 0:
+                            continue
+
+                        total_clients += 1
+
+                        try:
+                            session_parts = session_id.split('_')
+                            vod_channel_number = session_parts[1] if len(session_parts) >= 2 else session_id
+                        except Exception:
+                            vod_channel_number = session_id
+
+                        content_type = get_vod_field('content_obj_type', 'unknown')
+                        content_uuid = get_vod_field('content_uuid', '')
+                        content_name = get_vod_field('content_name', 'Unknown')
+                        client_ip = get_vod_field('client_ip', 'unknown')
+                        client_user_agent = get_vod_field('client_user_agent', 'unknown')
+                        worker_id = get_vod_field('worker_id', 'unknown')
+                        user_id_str = get_vod_field('user_id', '0')
+                        username = _resolve_username(user_id_str)
+
+                        session_id_safe = escape_label(session_id)
+                        vod_channel_number_safe = escape_label(vod_channel_number)
+                        content_name_safe = escape_label(content_name)
+                        client_ip_safe = escape_label(client_ip)
+                        client_user_agent_safe = _escape_user_agent(client_user_agent)
+                        worker_id_safe = escape_label(worker_id)
+                        username_safe = escape_label(username)
+
+                        connection_duration = 0
+                        created_at = float(get_vod_field('created_at', '0'))
+                        if created_at > 0:
+                            connection_duration = int(current_time - created_at)
+
+                        bytes_sent = int(get_vod_field('bytes_sent', '0'))
+                        avg_rate_bps = 0.0
+                        if connection_duration > 0 and bytes_sent > 0:
+                            avg_rate_bps = round((bytes_sent * 8 / connection_duration), 2)
+
+                        client_id_safe = session_id_safe
+                        base_labels = [
+                            f'type="vod"',
+                            f'client_id="{client_id_safe}"',
+                            f'channel_uuid="{session_id_safe}"',
+                            f'channel_number="{vod_channel_number_safe}"',
+                        ]
+                        base_labels_str = ','.join(base_labels)
+
+                        info_labels = base_labels + [
+                            f'content_uuid="{content_uuid}"',
+                            f'channel_name="{content_name_safe}"',
+                            f'content_type="{content_type}"',
+                            f'ip_address="{client_ip_safe}"',
+                            f'user_agent="{client_user_agent_safe}"',
+                            f'worker_id="{worker_id_safe}"',
+                            f'user_id="{user_id_str}"',
+                            f'username="{username_safe}"',
+                        ]
+                        client_values.write(f'dispatcharr_client_info{{{",".join(info_labels)}}} 1\n')
+
+                        if connection_duration > 0:
+                            client_values.write(f'dispatcharr_client_connection_duration_seconds{{{base_labels_str}}} {connection_duration}\n')
+                        if bytes_sent > 0:
+                            client_values.write(f'dispatcharr_client_bytes_sent{{{base_labels_str}}} {bytes_sent}\n')
+                        if avg_rate_bps > 0:
+                            client_values.write(f'dispatcharr_client_avg_transfer_rate_bps{{{base_labels_str}}} {avg_rate_bps:.2f}\n')
+                            client_values.write(f'dispatcharr_client_current_transfer_rate_bps{{{base_labels_str}}} {avg_rate_bps:.2f}\n')
+
+                    except Exception as e:
+                        logger.debug(f"Error processing VOD connection for clients: {e}")
 
             except Exception as e:
                 logger.debug(f"Error scanning VOD connections for clients: {e}")
 
-            metrics.append(f"dispatcharr_active_clients {total_clients}")
-            metrics.extend(client_metrics)
+            write(f"dispatcharr_active_clients {total_clients}\n")
+            write(client_values.getvalue())
 
         except Exception as e:
             logger.error(f"Error collecting client metrics: {e}")
 
-        metrics.append("")
-        return metrics
+        write("\n")
 
-    def _collect_user_metrics(self) -> list:
+    def _collect_user_metrics(self, out, vod_connections: list = None) -> None:
         """Collect Dispatcharr user information, stream limits, and active stream counts."""
-        from apps.accounts.models import User
-
-        metrics = []
-        metrics.append("# HELP dispatcharr_user_info Dispatcharr user information")
-        metrics.append("# TYPE dispatcharr_user_info gauge")
-        metrics.append("# HELP dispatcharr_user_date_joined_timestamp Unix timestamp of when the user account was created")
-        metrics.append("# TYPE dispatcharr_user_date_joined_timestamp gauge")
-        metrics.append("# HELP dispatcharr_user_stream_limit Configured concurrent stream limit for user (0 = unlimited)")
-        metrics.append("# TYPE dispatcharr_user_stream_limit gauge")
-        metrics.append("# HELP dispatcharr_user_active_streams Current number of active streams for user")
-        metrics.append("# TYPE dispatcharr_user_active_streams gauge")
+        write = out.write
+        write(_USER_HEADERS)
 
         # Count active streams per user_id from Redis
         active_streams_by_user = {}
@@ -1289,21 +1618,25 @@ class PrometheusMetricsCollector:
             redis = self.redis_client
             if not redis:
                 raise RuntimeError("Redis client not available")
-            # Live client keys
-            for key in redis.scan_iter(match=f"{_CHANNEL_KEY_PREFIX}:channel:*:clients:*", count=1000):
-                parts = key.split(':')
-                if len(parts) >= 5:
-                    uid_str = redis.hget(key, 'user_id')
-                    if uid_str:
-                        try:
-                            uid = int(uid_str)
-                            active_streams_by_user[uid] = active_streams_by_user.get(uid, 0) + 1
-                        except (ValueError, TypeError):
-                            pass
-            # VOD connection keys
-            for key in redis.scan_iter(match="vod_persistent_connection:*", count=1000):
-                uid_str = redis.hget(key, 'user_id')
-                active_str = redis.hget(key, 'active_streams')
+            # Live client keys: collect them all, then read every user_id in one pipeline
+            client_keys = [
+                key
+                for key in redis.scan_iter(match=f"{_CHANNEL_KEY_PREFIX}:channel:*:clients:*", count=_SCAN_COUNT)
+                if len(key.split(':')) >= 5
+            ]
+            for uid_str in self._pipeline(('hget', key, 'user_id') for key in client_keys):
+                if uid_str:
+                    try:
+                        uid = int(uid_str)
+                        active_streams_by_user[uid] = active_streams_by_user.get(uid, 0) + 1
+                    except (ValueError, TypeError):
+                        pass
+            # VOD connections
+            if vod_connections is None:
+                vod_connections = self._fetch_vod_connections()
+            for _session_id, connection_data in vod_connections:
+                uid_str = connection_data.get('user_id')
+                active_str = connection_data.get('active_streams')
                 try:
                     if uid_str and int(active_str or 0) > 0:
                         uid = int(uid_str)
@@ -1314,20 +1647,22 @@ class PrometheusMetricsCollector:
             logger.error(f"Error counting active streams per user: {e}", exc_info=True)
 
         try:
-            for user in User.objects.filter(is_active=True).order_by('id'):
+            # Plain tuples instead of model instances: only these columns are read
+            user_rows = User.objects.filter(is_active=True).order_by('id').values_list(
+                'id', 'username', 'user_level', 'is_staff', 'date_joined', 'stream_limit', 'custom_properties',
+            )
+            for uid, username, user_level, is_staff, date_joined, stream_limit, custom_properties in user_rows:
                 # Skip users without an XC password - they have no XC API access
-                if not (user.custom_properties or {}).get('xc_password'):
+                if not (custom_properties or {}).get('xc_password'):
                     continue
-                uid = user.id
-                username_safe = user.username.replace('\\', '\\\\').replace('"', '\\"')
-                user_level = user.user_level
+                username_safe = escape_label(username)
                 user_level_name = (
                     "admin" if user_level >= 10
                     else "standard" if user_level >= 1
                     else "streamer"
                 )
-                is_staff = "true" if user.is_staff else "false"
-                date_joined = int(user.date_joined.timestamp()) if user.date_joined else 0
+                is_staff = "true" if is_staff else "false"
+                date_joined = int(date_joined.timestamp()) if date_joined else 0
 
                 info_labels = (
                     f'user_id="{uid}",'
@@ -1335,13 +1670,12 @@ class PrometheusMetricsCollector:
                     f'user_level="{user_level_name}",'
                     f'is_staff="{is_staff}"'
                 )
-                metrics.append(f'dispatcharr_user_info{{{info_labels}}} 1')
-                metrics.append(f'dispatcharr_user_date_joined_timestamp{{user_id="{uid}",username="{username_safe}"}} {date_joined}')
-                metrics.append(f'dispatcharr_user_stream_limit{{user_id="{uid}",username="{username_safe}"}} {user.stream_limit}')
-                metrics.append(f'dispatcharr_user_active_streams{{user_id="{uid}",username="{username_safe}"}} {active_streams_by_user.get(uid, 0)}')
+                write(f'dispatcharr_user_info{{{info_labels}}} 1\n')
+                write(f'dispatcharr_user_date_joined_timestamp{{user_id="{uid}",username="{username_safe}"}} {date_joined}\n')
+                write(f'dispatcharr_user_stream_limit{{user_id="{uid}",username="{username_safe}"}} {stream_limit}\n')
+                write(f'dispatcharr_user_active_streams{{user_id="{uid}",username="{username_safe}"}} {active_streams_by_user.get(uid, 0)}\n')
 
         except Exception as e:
             logger.error(f"Error collecting user metrics: {e}", exc_info=True)
 
-        metrics.append("")
-        return metrics
+        write("\n")
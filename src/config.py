@@ -14,6 +14,8 @@ import os
 DEFAULT_PORT: int = 9192
 DEFAULT_HOST: str = "0.0.0.0"
 AUTO_START_DEFAULT: bool = True
+METRICS_CACHE_TTL_DEFAULT: int = 5  # seconds
+MAX_CONCURRENT_SCRAPES_DEFAULT: int = 64
 
 # Key used to look up this plugin's settings in Dispatcharr's PluginConfig
 # table. Dispatcharr derives the key from the zip folder name, which may be
@@ -39,6 +41,11 @@ REDIS_KEY_PORT    = "prometheus_exporter:server_port"
 REDIS_KEY_STOP    = "prometheus_exporter:stop_requested"
 REDIS_KEY_LEADER  = "prometheus_exporter:leader"
 REDIS_KEY_MANUAL_STOP = "prometheus_exporter:manual_stop"
+REDIS_KEY_STOPPED_ACK = "prometheus_exporter:stopped_ack"
+REDIS_KEY_OWNER = "prometheus_exporter:server_owner"  # token of the server that set the flags
+
+# Pub/Sub channel the running server listens on for control messages ("stop").
+REDIS_CHANNEL_CONTROL = "prometheus_exporter:control"
 
 # Keys to wipe on startup (leader key intentionally excluded so the winning
 # worker keeps its claim after cleanup).
@@ -48,6 +55,8 @@ CLEANUP_REDIS_KEYS = [
     REDIS_KEY_PORT,
     REDIS_KEY_STOP,
     REDIS_KEY_MANUAL_STOP,
+    REDIS_KEY_STOPPED_ACK,
+    REDIS_KEY_OWNER,
     # Historical keys that may exist from older plugin versions
     "prometheus_exporter:autostart_completed",
 ]
@@ -56,10 +65,23 @@ CLEANUP_REDIS_KEYS = [
 # It only needs to outlast the server startup sequence.
 LEADER_TTL = 60  # seconds
 
-# Heartbeat TTL for "running" Redis keys.  The server refreshes its keys on
-# every monitoring loop iteration (1s).  If the process dies, the keys expire
-# and autostart can proceed on the next startup.
+# Heartbeat TTL for "running" Redis keys.  The server refreshes its keys every
+# HEARTBEAT_INTERVAL seconds.  If the process dies, the keys expire and
+# autostart can proceed on the next startup.
 HEARTBEAT_TTL = 30  # seconds
+HEARTBEAT_INTERVAL = 10  # seconds
+
+# How long a server's stop acknowledgement waits to be consumed.
+STOPPED_ACK_TTL = 10  # seconds
+
+# A stopping server closes connections idle between keep-alive requests at
+# once, gives in-flight requests SERVER_STOP_TIMEOUT seconds (gevent then
+# allows 1s more to kill them) and waits up to PORT_RELEASE_TIMEOUT seconds
+# for the port to free.  STOP_CONFIRM_TIMEOUT, how long a stop request waits
+# for the server to confirm, covers that worst case with room for Redis.
+SERVER_STOP_TIMEOUT = 5  # seconds
+PORT_RELEASE_TIMEOUT = 3  # seconds
+STOP_CONFIRM_TIMEOUT = SERVER_STOP_TIMEOUT + 1 + PORT_RELEASE_TIMEOUT + 3  # seconds
 
 # ── Plugin field definitions ─────────────────────────────────────────────────
 # Shared between the Plugin class (used by Dispatcharr UI) and the collector
@@ -145,4 +167,27 @@ PLUGIN_FIELDS = [
         "default": False,
         "description": "Include user account metrics (user info, stream limits, active stream counts).",
     },
+    {
+        "id": "metrics_cache_ttl",
+        "label": "Metrics Cache TTL (seconds)",
+        "type": "number",
+        "default": METRICS_CACHE_TTL_DEFAULT,
+        "description": (
+            "Reuse the last /metrics response for this many seconds so repeated "
+            "or concurrent scrapes don't re-query the database. Set to 0 to disable."
+        ),
+        "placeholder": "5",
+    },
+    {
+        "id": "max_concurrent_scrapes",
+        "label": "Max Concurrent Connections",
+        "type": "number",
+        "default": MAX_CONCURRENT_SCRAPES_DEFAULT,
+        "description": (
+            "Maximum number of HTTP connections served at once, including idle "
+            "keep-alive connections such as Prometheus's. Further connections "
+            "wait in the listen queue until one closes."
+        ),
+        "placeholder": "64",
+    },
 ]
@@ -6,16 +6,88 @@ Binds to a configurable host:port and serves:
   GET /health    Simple health check
 """
 
+import itertools
 import logging
 import socket
 import threading
 import time
-
-from .config import PLUGIN_CONFIG, REDIS_KEY_RUNNING, REDIS_KEY_HOST, REDIS_KEY_PORT, REDIS_KEY_STOP, DEFAULT_PORT, DEFAULT_HOST, HEARTBEAT_TTL
-from .utils import get_redis_client, read_redis_flag, normalize_host, get_dispatcharr_version, compare_versions
+import uuid
+
+try:
+    from gevent import pywsgi
+    from gevent.event import Event
+    from gevent.lock import Semaphore
+    from gevent.pool import Pool
+except ImportError:  # reported by MetricsServer.start()
+    pywsgi = None
+
+from .config import (
+    PLUGIN_CONFIG, REDIS_KEY_STOP, REDIS_KEY_STOPPED_ACK,
+    REDIS_CHANNEL_CONTROL, SERVER_STOP_TIMEOUT, PORT_RELEASE_TIMEOUT, STOP_CONFIRM_TIMEOUT, DEFAULT_PORT, DEFAULT_HOST, HEARTBEAT_TTL, HEARTBEAT_INTERVAL, STOPPED_ACK_TTL,
+    METRICS_CACHE_TTL_DEFAULT, MAX_CONCURRENT_SCRAPES_DEFAULT,
+)
+from .utils import (
+    get_redis_client, reset_redis_client, is_redis_flag, normalize_host, get_dispatcharr_version, compare_versions,
+    claim_server_flags, announce_server_flags, clear_server_flags, refresh_server_flags,
+)
 
 logger = logging.getLogger(__name__)
 
+# Pending-connection queue length for the listening socket.  Scrapers reuse
+# one keep-alive connection, but a burst of reconnects (e.g. after a
+# Prometheus restart) should queue in the kernel rather than be refused.
+# Linux silently caps this at net.core.somaxconn.
+_LISTEN_BACKLOG = 2048
+
+# Seconds before the control channel listener re-subscribes after losing its
+# connection, doubling on each consecutive failure up to the maximum.
+_CONTROL_RETRY_DELAY = 0.5
+_CONTROL_RETRY_MAX = 5
+
+
+if pywsgi is not None:
+    class _ScrapeHandler(pywsgi.WSGIHandler):
+        """WSGI handler that records its connection while it waits for a request.
+
+        Once the server is closing, a connection coming back for its next
+        keep-alive request is closed instead.
+        """
+
+        def read_requestline(self):
+            if self.server.closed:
+                return ''
+            idle_sockets = self.server.idle_sockets
+            sock = self.socket
+            idle_sockets.add(sock)
+            try:
+                return super().read_requestline()
+            finally:
+                idle_sockets.discard(sock)
+
+    class _ScrapeServer(pywsgi.WSGIServer):
+        """WSGIServer whose stop() closes idle keep-alive connections first.
+
+        Each open connection holds a pool slot, and stop() waits for the pool;
+        a scraper's idle keep-alive connection would otherwise hold shutdown
+        for the full stop timeout.  Requests in flight are still waited for.
+        """
+
+        handler_class = _ScrapeHandler
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.idle_sockets = set()
+
+        def stop(self, timeout=None):
+            self.close()
+            for sock in list(self.idle_sockets):
+                try:
+                    sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+            super().stop(timeout=timeout)
+
+
 # Module-level reference to the currently running server instance (per process).
 _metrics_server = None
 
@@ -31,87 +103,32 @@ def set_current_server(server):
     _metrics_server = server
 
 
-class MetricsServer:
-    """Lightweight gevent WSGI server that exposes Prometheus metrics."""
+_HEALTH_HEADERS = (('Content-Type', 'text/plain'), ('Content-Length', '3'))
+_NOT_FOUND_HEADERS = (('Content-Type', 'text/plain'), ('Content-Length', '10'))
 
-    def __init__(self, collector, port=None, host=None):
-        self.collector = collector
-        self.port = port if port is not None else DEFAULT_PORT
-        self.host = normalize_host(host, DEFAULT_HOST)
-        logger.info(
-            f"MetricsServer initialised with host='{self.host}', port={self.port}"
-        )
-        self.server_thread = None
-        self.server = None
-        self.running = False
-        self.settings = {}
 
-    # ── Version helpers ──────────────────────────────────────────────────────
-
-    @staticmethod
-    def _get_dispatcharr_version():
-        """Deprecated shim kept for callers that used the old static method."""
-        return get_dispatcharr_version()
-
-    @staticmethod
-    def _compare_versions(current, minimum):
-        """Deprecated shim kept for callers that used the old static method."""
-        return compare_versions(current, minimum)
-
-    # ── Port verification ────────────────────────────────────────────────────
+def _health(start_response):
+    """Serve ``GET /health``."""
+    start_response('200 OK', list(_HEALTH_HEADERS))
+    return [b"OK\n"]
 
-    def _verify_stopped(self, timeout=3):
-        """Block until the server port is confirmed free (up to *timeout* seconds)."""
-        deadline = time.time() + timeout
-        while time.time() < deadline:
-            try:
-                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-                sock.settimeout(0.5)
-                sock.bind((self.host, self.port))
-                sock.close()
-                logger.info(f"Verified port {self.port} is free after server stop")
-                return True
-            except OSError:
-                try:
-                    sock.close()
-                except Exception:
-                    pass
-                time.sleep(0.2)
 
-        logger.warning(
-            f"Port {self.port} still in use after {timeout}s - server may not have stopped cleanly"
-        )
-        return False
+def _not_found(start_response):
+    """Serve any path without a route."""
+    start_response('404 Not Found', list(_NOT_FOUND_HEADERS))
+    return [b"Not Found\n"]
 
-    # ── WSGI application ─────────────────────────────────────────────────────
 
-    def wsgi_app(self, environ, start_response):
-        """Handle a single HTTP request."""
-        path = environ.get('PATH_INFO', '/')
+def _render_landing_page() -> bytes:
+    """Return the HTML for ``GET /``, built from plugin.json."""
+    plugin_name = PLUGIN_CONFIG.get('name', 'Dispatcharr Exporter')
+    plugin_version = PLUGIN_CONFIG.get('version', 'unknown version').lstrip('-')
+    plugin_description = PLUGIN_CONFIG.get('description', 'This exporter provides Prometheus metrics for Dispatcharr.')
+    plugin_summary = plugin_description.partition('. ')[0]  # first sentence
+    repo_url = PLUGIN_CONFIG.get('repo_url', 'https://github.com/sethwv/dispatcharr-exporter')
+    releases_url = f"{repo_url}/releases"
 
-        if path == '/metrics':
-            try:
-                metrics_text = self.collector.collect_metrics(settings=self.settings)
-                start_response('200 OK', [('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')])
-                return [metrics_text.encode('utf-8')]
-            except Exception as e:
-                logger.error(f"Error generating metrics: {e}", exc_info=True)
-                start_response('500 Internal Server Error', [('Content-Type', 'text/plain')])
-                return [f"# Error: {str(e)}\n".encode('utf-8')]
-
-        elif path == '/health':
-            start_response('200 OK', [('Content-Type', 'text/plain')])
-            return [b"OK\n"]
-
-        elif path == '/':
-            plugin_name = PLUGIN_CONFIG.get('name', 'Dispatcharr Exporter')
-            plugin_version = PLUGIN_CONFIG.get('version', 'unknown version').lstrip('-')
-            plugin_description = PLUGIN_CONFIG.get('description', 'This exporter provides Prometheus metrics for Dispatcharr.')
-            repo_url = PLUGIN_CONFIG.get('repo_url', 'https://github.com/sethwv/dispatcharr-exporter')
-            releases_url = f"{repo_url}/releases"
-
-            html = f"""<!DOCTYPE html>
+    html = f"""<!DOCTYPE html>
 <html>
 <head>
     <title>{plugin_name}</title>
@@ -144,7 +161,7 @@ class MetricsServer:
     <div class="container">
         <h1>{plugin_name}</h1>
         <div class="version">{plugin_version}</div>
-        <p>{plugin_description.split('. ')[0]}.</p>
+        <p>{plugin_summary}.</p>
         <div class="external-links">
             <a href="{repo_url}" target="_blank">GitHub Repository</a>
             <a href="{releases_url}" target="_blank">Releases</a>
@@ -156,12 +173,205 @@ class MetricsServer:
     </div>
 </body>
 </html>"""
-            start_response('200 OK', [('Content-Type', 'text/html; charset=utf-8')])
-            return [html.encode('utf-8')]
+    return html.encode('utf-8')
 
+
+class MetricsServer:
+    """Lightweight gevent WSGI server that exposes Prometheus metrics."""
+
+    def __init__(self, collector, port=None, host=None):
+        self.collector = collector
+        self.port = port if port is not None else DEFAULT_PORT
+        self.host = normalize_host(host, DEFAULT_HOST)
+        logger.info(
+            f"MetricsServer initialised with host='{self.host}', port={self.port}"
+        )
+        self.server_thread = None
+        self.server = None
+        self._running = threading.Event()  # set while the server is serving
+        self.settings = {}
+        self._stop_event = None  # gevent Event, created in run_server()
+        self._ready = threading.Event()  # set once run_server has bound (or failed)
+        self._abort_start = threading.Event()  # set when start() gives up waiting
+        # Written to REDIS_KEY_OWNER with the running flags, so shutdown only
+        # clears flags this server set; see utils.clear_server_flags()
+        self._owner_token = uuid.uuid4().hex
+        # /metrics response cache: (expires_at_monotonic, chunks, content_length)
+        self._metrics_cache = None
+        self._metrics_cache_ttl = 0
+        self._metrics_lock = None  # gevent Semaphore, created in start()
+        self._landing_page = None  # rendered HTML bytes; see _handle_landing_page()
+        self._routes = {
+            '/metrics': self._handle_metrics,
+            '/health': _health,
+            '/': self._handle_landing_page,
+        }
+
+    # ── Version helpers ──────────────────────────────────────────────────────
+
+    @staticmethod
+    def _get_dispatcharr_version():
+        """Deprecated shim kept for callers that used the old static method."""
+        return get_dispatcharr_version()
+
+    @staticmethod
+    def _compare_versions(current, minimum):
+        """Deprecated shim kept for callers that used the old static method."""
+        return compare_versions(current, minimum)
+
+    # ── Port verification ────────────────────────────────────────────────────
+
+    def _verify_stopped(self, timeout=3):
+        """Block until the server port is confirmed free (up to *timeout* seconds)."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+                    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+                    sock.bind((self.host, self.port))
+                logger.info(f"Verified port {self.port} is free after server stop")
+                return True
+            except OSError:
+                time.sleep(0.2)
+
+        logger.warning(
+            f"Port {self.port} still in use after {timeout}s - server may not have stopped cleanly"
+        )
+        return False
+
+    def _bind_listener(self):
+        """Return a socket bound and listening on host:port.
+
+        SO_REUSEADDR lets a restarted server rebind while the previous
+        listener's connections sit in TIME_WAIT; the bind still fails with
+        EADDRINUSE if another process is listening on the port.
+        """
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            sock.bind((self.host, self.port))
+            sock.listen(_LISTEN_BACKLOG)
+            # gevent accepts from the raw socket and expects it non-blocking
+            sock.setblocking(False)
+        except BaseException:
+            sock.close()
+            raise
+        return sock
+
+    # ── Control channel ──────────────────────────────────────────────────────
+
+    def _listen_for_stop(self, redis_client):
+        """Wait on the Redis control channel and set the stop event when one arrives.
+
+        Runs in its own thread so a blocking socket read never stalls the
+        gevent hub; the one-second read timeout only bounds how long the
+        thread lingers after the server stops by other means.  A dropped
+        connection is re-subscribed with backoff until the server stops, and
+        the stop flag is read after each subscribe so a stop published while
+        unsubscribed is not left to the next heartbeat.
+        """
+        retry_delay = _CONTROL_RETRY_DELAY
+        while self._running.is_set() and not self._stop_event.is_set():
+            pubsub = None
+            try:
+                pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(REDIS_CHANNEL_CONTROL)
+                if is_redis_flag(redis_client.get(REDIS_KEY_STOP)):
+                    logger.info("Stop flag found in Redis")
+                    self._stop_event.set()
+                    break
+                retry_delay = _CONTROL_RETRY_DELAY
+                while self._running.is_set() and not self._stop_event.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message and message.get('data') in ('stop', b'stop'):
+                        logger.info("Stop signal received on control channel")
+                        self._stop_event.set()
+            except Exception as e:
+                logger.warning(f"Control channel listener lost its connection, retrying in {retry_delay}s: {e}")
+                time.sleep(retry_delay)
+                retry_delay = min(retry_delay * 2, _CONTROL_RETRY_MAX)
+                redis_client = get_redis_client() or redis_client
+            finally:
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
+
+    # ── Metrics response cache ───────────────────────────────────────────────
+
+    def _get_metrics_body(self):
+        """Return ``(chunks, content_length)`` for the /metrics response.
+
+        With caching enabled the encoded chunks are kept for the TTL and the
+        length is known.  Only one greenlet regenerates an expired payload;
+        scrapes arriving meanwhile are handed the previous payload instead of
+        queueing behind it, but only for one TTL past its expiry.  With no
+        payload yet, or one older than that, they wait on the semaphore.
+        Without caching the chunks are streamed as each section is collected
+        and the length is ``None``.
+        """
+        if self._metrics_cache_ttl <= 0 or self._metrics_lock is None:
+            chunks = self.collector.collect_metrics_iter(settings=self.settings)
+            # Pull the first chunk here so setup errors still produce a 500
+            first = next(chunks, b"")
+            return itertools.chain((first,), chunks), None
+
+        cached = self._metrics_cache
+        now = time.monotonic()
+        if cached is not None and now < cached[0]:
+            return cached[1], cached[2]
+        if cached is not None and now < cached[0] + self._metrics_cache_ttl:
+            if not self._metrics_lock.acquire(blocking=False):
+                # Another scrape is already regenerating; serve the stale copy
+                return cached[1], cached[2]
         else:
-            start_response('404 Not Found', [('Content-Type', 'text/plain')])
-            return [b"Not Found\n"]
+            self._metrics_lock.acquire()
+
+        try:
+            cached = self._metrics_cache
+            if cached and time.monotonic() < cached[0]:
+                return cached[1], cached[2]
+            chunks = list(self.collector.collect_metrics_iter(settings=self.settings))
+            content_length = sum(len(chunk) for chunk in chunks)
+            self._metrics_cache = (time.monotonic() + self._metrics_cache_ttl, chunks, content_length)
+            return chunks, content_length
+        finally:
+            self._metrics_lock.release()
+
+    # ── WSGI application ─────────────────────────────────────────────────────
+
+    def wsgi_app(self, environ, start_response):
+        """Handle a single HTTP request by dispatching on its path."""
+        handler = self._routes.get(environ.get('PATH_INFO', '/'), _not_found)
+        return handler(start_response)
+
+    def _handle_metrics(self, start_response):
+        """Serve ``GET /metrics``."""
+        try:
+            chunks, content_length = self._get_metrics_body()
+            headers = [('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')]
+            if content_length is not None:
+                headers.append(('Content-Length', str(content_length)))
+            start_response('200 OK', headers)
+            return chunks
+        except Exception as e:
+            logger.error(f"Error generating metrics: {e}", exc_info=True)
+            body = f"# Error: {str(e)}\n".encode('utf-8')
+            start_response('500 Internal Server Error', [
+                ('Content-Type', 'text/plain'), ('Content-Length', str(len(body))),
+            ])
+            return [body]
+
+    def _handle_landing_page(self, start_response):
+        """Serve ``GET /``; the page only depends on plugin.json, so it is rendered once."""
+        if self._landing_page is None:
+            self._landing_page = _render_landing_page()
+        body = self._landing_page
+        start_response('200 OK', [
+            ('Content-Type', 'text/html; charset=utf-8'), ('Content-Length', str(len(body))),
+        ])
+        return [body]
 
     # ── Lifecycle ────────────────────────────────────────────────────────────
 
@@ -170,16 +380,12 @@ class MetricsServer:
 
         Returns True on success, False if the server could not be started.
         """
-        if self.running:
+        if self._running.is_set():
             logger.warning("Metrics server is already running")
             return False
 
-        # Guard against duplicate servers across workers via Redis
-        redis_client = get_redis_client()
-        if redis_client and read_redis_flag(redis_client, REDIS_KEY_RUNNING):
-            logger.warning(
-                "Another metrics server instance is already running (detected via Redis)"
-            )
+        if pywsgi is None:
+            logger.error("gevent is not installed")
             return False
 
         # Guard against a duplicate in the same process
@@ -188,6 +394,24 @@ class MetricsServer:
             logger.warning("Another metrics server instance is already running in this process")
             return False
 
+        # Guard against duplicate servers across workers via Redis: the
+        # running flag is checked and claimed in one step, and released
+        # again below if this start fails.  Without a claim the server is
+        # not started, as it could not be announced, stopped or kept alive.
+        redis_client = get_redis_client()
+        if not redis_client:
+            logger.error("Cannot start metrics server: Redis is unavailable")
+            return False
+        try:
+            if not claim_server_flags(redis_client, self._owner_token, HEARTBEAT_TTL):
+                logger.warning(
+                    "Another metrics server instance is already running (detected via Redis)"
+                )
+                return False
+        except Exception as e:
+            logger.error(f"Cannot start metrics server: could not claim the Redis running flag: {e}")
+            return False
+
         # Check Dispatcharr version
         min_version = PLUGIN_CONFIG.get("min_dispatcharr_version", "1.0.0")
         try:
@@ -199,6 +423,7 @@ class MetricsServer:
                     logger.error(
                         f"Dispatcharr {dispatcharr_version} does not meet minimum requirement {min_version}"
                     )
+                    self._release_claim(redis_client)
                     return False
                 else:
                     logger.info(f"Dispatcharr {dispatcharr_version} meets minimum requirement {min_version}")
@@ -207,158 +432,238 @@ class MetricsServer:
         except Exception as e:
             logger.warning(f"Could not verify Dispatcharr version: {e}. Proceeding anyway.")
 
-        # Validate host / port binding
+        # Bind the listening socket here rather than probing the port first:
+        # a bad host or a port in use is reported synchronously, and there is
+        # no window between the probe and the real bind for another process
+        # to take the port.
         logger.info(f"Attempting to bind to host='{self.host}', port={self.port}")
         try:
-            try:
-                socket.getaddrinfo(self.host, self.port, socket.AF_INET, socket.SOCK_STREAM)
-            except socket.gaierror as e:
-                logger.error(
-                    f"Cannot resolve host '{self.host}': {e}. "
-                    f"In Docker, use '0.0.0.0' to bind to all interfaces."
-                )
-                return False
-
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-            sock.bind((self.host, self.port))
-            sock.close()
+            listener = self._bind_listener()
         except OSError as e:
-            if e.errno == -2 or 'Name or service not known' in str(e):
+            if isinstance(e, socket.gaierror) or 'Name or service not known' in str(e):
                 logger.error(
                     f"Cannot resolve host '{self.host}': {e}. "
                     f"In Docker, use '0.0.0.0' to bind to all interfaces."
                 )
             else:
                 logger.error(f"Cannot bind to {self.host}:{self.port}: {e}")
+            self._release_claim(redis_client)
             return False
 
         self.settings = settings or {}
-
+        self._metrics_cache = None
         try:
-            from gevent import pywsgi
+            self._metrics_cache_ttl = max(0.0, float(
+                self.settings.get('metrics_cache_ttl', METRICS_CACHE_TTL_DEFAULT)
+            ))
+        except (TypeError, ValueError):
+            self._metrics_cache_ttl = METRICS_CACHE_TTL_DEFAULT
+        try:
+            max_concurrent = max(1, int(
+                self.settings.get('max_concurrent_scrapes', MAX_CONCURRENT_SCRAPES_DEFAULT)
+            ))
+        except (TypeError, ValueError):
+            max_concurrent = MAX_CONCURRENT_SCRAPES_DEFAULT
 
-            def run_server():
-                try:
-                    logger.debug(f"Starting gevent WSGI server on {self.host}:{self.port}")
-
-                    suppress_logs = self.settings.get('suppress_access_logs', True)
-                    server_kwargs = {
-                        'listener': (self.host, self.port),
-                        'application': self.wsgi_app,
-                    }
-                    if suppress_logs:
-                        server_kwargs['log'] = None
-
-                    self.server = pywsgi.WSGIServer(**server_kwargs)
-                    self.running = True
-                    set_current_server(self)
-
-                    # Announce via Redis (with heartbeat TTL)
-                    _rc = get_redis_client()
-                    if _rc:
-                        try:
-                            _rc.set(REDIS_KEY_RUNNING, "1", ex=HEARTBEAT_TTL)
-                            _rc.set(REDIS_KEY_HOST, self.host, ex=HEARTBEAT_TTL)
-                            _rc.set(REDIS_KEY_PORT, str(self.port), ex=HEARTBEAT_TTL)
-                        except Exception as e:
-                            logger.warning(f"Could not set Redis running flags: {e}")
-
-                    logger.info(f"Metrics server started on http://{self.host}:{self.port}/metrics")
-
-                    from gevent import spawn, sleep
-                    spawn(self.server.serve_forever)
-
-                    # Monitor for Redis stop signal
-                    monitor_redis = get_redis_client()
-                    check_count = 0
-                    while self.running:
-                        try:
-                            if monitor_redis and read_redis_flag(monitor_redis, REDIS_KEY_STOP):
-                                logger.info("Stop signal detected via Redis, shutting down")
-                                self.running = False
-                                try:
-                                    self.server.stop(timeout=5)
-                                except Exception as e:
-                                    logger.warning(f"Error during server.stop(): {e}")
-                                self._verify_stopped(timeout=3)
-                                break
-                            elif not monitor_redis:
-                                monitor_redis = get_redis_client()
-
-                            check_count += 1
-                            if check_count % 60 == 0:
-                                logger.debug(
-                                    f"Stop signal monitor alive (check #{check_count}), "
-                                    f"server running on {self.host}:{self.port}"
-                                )
-                        except Exception as e:
-                            logger.warning(f"Error checking stop signal (check #{check_count}): {e}")
-                            monitor_redis = get_redis_client()
-
-                        # Refresh heartbeat so keys don't expire while alive
-                        if monitor_redis:
-                            try:
-                                monitor_redis.set(REDIS_KEY_RUNNING, "1", ex=HEARTBEAT_TTL)
-                                monitor_redis.expire(REDIS_KEY_HOST, HEARTBEAT_TTL)
-                                monitor_redis.expire(REDIS_KEY_PORT, HEARTBEAT_TTL)
-                            except Exception:
-                                pass
-
-                        sleep(1)
-
-                    # Cleanup Redis flags after stopping
-                    _rc = get_redis_client()
-                    if _rc:
-                        try:
-                            _rc.delete(REDIS_KEY_RUNNING, REDIS_KEY_HOST, REDIS_KEY_PORT, REDIS_KEY_STOP)
-                        except Exception as e:
-                            logger.warning(f"Could not clear Redis flags on shutdown: {e}")
-
-                    set_current_server(None)
-                    logger.info("Metrics server stopped and cleaned up")
+        self._metrics_lock = Semaphore(1)
 
+        def run_server():
+            try:
+                logger.debug(f"Starting gevent WSGI server on {self.host}:{self.port}")
+
+                suppress_logs = self.settings.get('suppress_access_logs', True)
+                server_kwargs = {
+                    'listener': listener,
+                    'application': self.wsgi_app,
+                    # Bound the handler greenlets, one per open connection
+                    # (idle keep-alive ones included); excess connections
+                    # wait in the listen backlog instead.
+                    'spawn': Pool(max_concurrent),
+                }
+                if suppress_logs:
+                    server_kwargs['log'] = None
+
+                self.server = _ScrapeServer(**server_kwargs)
+                # gevent events can be set from other native threads, so
+                # stop() and the control listener can wake this loop.
+                self._stop_event = Event()
+                if self._abort_start.is_set():
+                    # start() timed out and has already reported failure
+                    listener.close()
+                    return
+
+                # Announce the endpoint under the claim taken in start().  The
+                # listener already queues connections, so it is published
+                # before serving; a lost claim means another server owns the
+                # flags and this one must not serve.
+                _rc = get_redis_client()
+                if _rc:
+                    try:
+                        if not announce_server_flags(
+                            _rc, self._owner_token, self.host, self.port, HEARTBEAT_TTL,
+                        ):
+                            logger.warning("Lost the Redis running flag claim before serving, not starting")
+                            listener.close()
+                            self._ready.set()
+                            return
+                    except Exception as e:
+                        logger.warning(f"Could not set Redis running flags: {e}")
+
+                self.server.start()
+                self._running.set()
+                set_current_server(self)
+
+                logger.info(f"Metrics server started on http://{self.host}:{self.port}/metrics")
+                self._ready.set()
+
+                # Stop requests arrive on the control channel or from
+                # stop() in this process; both set _stop_event.  The stop
+                # flag is only re-read alongside the heartbeat, in case a
+                # message was published while the listener was not
+                # subscribed.
+                monitor_redis = get_redis_client()
+                if monitor_redis:
+                    threading.Thread(
+                        target=self._listen_for_stop, args=(monitor_redis,), daemon=True,
+                    ).start()
+
+                heartbeats = 0
+                owns_flags = True
+                while not self._stop_event.wait(timeout=HEARTBEAT_INTERVAL):
+                    if not monitor_redis:
+                        monitor_redis = get_redis_client()
+                        continue
+
+                    # Refresh heartbeat so keys don't expire while alive,
+                    # reading the stop flag in the same round trip.  The
+                    # flags are only extended while this server still owns them.
+                    try:
+                        pipe = monitor_redis.pipeline(transaction=True)
+                        pipe.get(REDIS_KEY_STOP)
+                        refresh_server_flags(monitor_redis, self._owner_token, HEARTBEAT_TTL, pipe=pipe)
+                        stop_flag, owned = pipe.execute()
+                    except Exception as e:
+                        logger.warning(f"Could not refresh heartbeat: {e}")
+                        # Re-resolve the client before the next heartbeat
+                        reset_redis_client()
+                        monitor_redis = None
+                        continue
+                    if not owned:
+                        # Cleared by a forced stop, expired during a Redis
+                        # outage, or claimed by another server: either way
+                        # this server is no longer the registered one
+                        logger.warning(
+                            "Metrics server no longer owns the Redis running flags, "
+                            f"shutting down the server on {self.host}:{self.port}"
+                        )
+                        owns_flags = False
+                        break
+                    if is_redis_flag(stop_flag):
+                        logger.info("Stop flag found in Redis")
+                        break
+
+                    heartbeats += 1
+                    if heartbeats % 6 == 0:
+                        logger.debug(
+                            f"Stop signal monitor alive (heartbeat #{heartbeats}), "
+                            f"server running on {self.host}:{self.port}"
+                        )
+
+                logger.info("Stop requested, shutting down metrics server")
+                self._running.clear()
+                try:
+                    self.server.stop(timeout=SERVER_STOP_TIMEOUT)
                 except Exception as e:
-                    logger.error(f"Error running metrics server: {e}", exc_info=True)
-                    self.running = False
-
-            self.server_thread = threading.Thread(target=run_server, daemon=True)
-            self.server_thread.start()
-
-            # Brief wait for the server to bind and set running=True
-            time.sleep(0.5)
-
-            if self.running:
-                return True
-            else:
-                return False
+                    logger.warning(f"Error during server.stop(): {e}")
+                self._verify_stopped(timeout=PORT_RELEASE_TIMEOUT)
+
+                # Cleanup Redis flags after stopping, then acknowledge the
+                # stop for a caller blocked in BLPOP (see Plugin.run)
+                _rc = get_redis_client()
+                # A server that lost its flags leaves the stop key and
+                # acknowledgement alone; they may belong to a newer server
+                if _rc and owns_flags:
+                    try:
+                        pipe = _rc.pipeline(transaction=False)
+                        clear_server_flags(_rc, self._owner_token, pipe=pipe)
+                        pipe.delete(REDIS_KEY_STOP)
+                        pipe.lpush(REDIS_KEY_STOPPED_ACK, "1")
+                        pipe.expire(REDIS_KEY_STOPPED_ACK, STOPPED_ACK_TTL)
+                        pipe.execute()
+                    except Exception as e:
+                        logger.warning(f"Could not clear Redis flags on shutdown: {e}")
+
+                if get_current_server() is self:
+                    set_current_server(None)
+                logger.info("Metrics server stopped and cleaned up")
 
-        except ImportError:
-            logger.error("gevent is not installed")
+            except Exception as e:
+                logger.error(f"Error running metrics server: {e}", exc_info=True)
+                listener.close()
+                self._running.clear()
+                self._ready.set()
+
+        # Under gevent's monkey patching this thread is itself a greenlet
+        # on the worker's hub; otherwise it hosts a hub of its own.
+        self._ready = threading.Event()
+        self._abort_start = threading.Event()
+        self.server_thread = threading.Thread(target=run_server, daemon=True)
+        self.server_thread.start()
+
+        # Wait for the bind to succeed or fail instead of a fixed delay
+        if not self._ready.wait(timeout=5):
+            logger.warning(f"Metrics server did not report ready within 5s on {self.host}:{self.port}")
+            # Stop the thread before reporting failure so it cannot come up
+            # and serve after its claim has been released
+            self._abort_start.set()
+            if self._stop_event is not None:
+                self._stop_event.set()
+            self.server_thread.join(timeout=STOP_CONFIRM_TIMEOUT)
+            if self.server_thread.is_alive():
+                logger.warning("Metrics server thread did not exit after the start timeout")
+            self._release_claim(redis_client)
+            return False
+        if not self._running.is_set():
+            self._release_claim(redis_client)
             return False
+        return True
+
+    def _release_claim(self, redis_client) -> None:
+        """Drop the Redis running flag claimed by a start() that then failed."""
+        if redis_client:
+            try:
+                clear_server_flags(redis_client, self._owner_token)
+            except Exception as e:
+                logger.warning(f"Could not release the Redis running flag: {e}")
 
     def stop(self) -> bool:
-        """Stop the metrics server."""
-        if not self.running:
+        """Stop the metrics server.
+
+        Wakes the server's monitor loop, which shuts the WSGI server down and
+        clears the Redis state, and waits for it to finish.
+        """
+        if not self._running.is_set():
             return False
 
         logger.info("Stopping metrics server...")
 
-        if self.server:
-            try:
-                self.server.stop(timeout=5)
-            except Exception as e:
-                logger.warning(f"Error during server.stop(): {e}")
-            self._verify_stopped(timeout=3)
+        if self._stop_event is not None:
+            self._stop_event.set()
+        if self.server_thread is not None:
+            self.server_thread.join(timeout=STOP_CONFIRM_TIMEOUT)
+            if not self.server_thread.is_alive():
+                return True
 
-        self.running = False
-        set_current_server(None)
+        logger.warning(f"Metrics server did not shut down within {STOP_CONFIRM_TIMEOUT}s, clearing its state")
+        self._running.clear()
+        if get_current_server() is self:
+            set_current_server(None)
 
         # Clear Redis flags
         redis_client = get_redis_client()
         if redis_client:
             try:
-                redis_client.delete(REDIS_KEY_RUNNING, REDIS_KEY_HOST, REDIS_KEY_PORT)
+                clear_server_flags(redis_client, self._owner_token)
             except Exception as e:
                 logger.warning(f"Could not clear Redis flags: {e}")
 
@@ -366,4 +671,4 @@ class MetricsServer:
 
     def is_running(self) -> bool:
         """Return True if the server thread is alive and the server is marked running."""
-        return self.running and self.server_thread is not None and self.server_thread.is_alive()
+        return self._running.is_set() and self.server_thread is not None and self.server_thread.is_alive()
@@ -2,18 +2,131 @@
 
 import logging
 import re
+import sys
+import threading
+import time
+
+from .config import (
+    REDIS_CHANNEL_CONTROL, REDIS_KEY_RUNNING, REDIS_KEY_HOST, REDIS_KEY_PORT, REDIS_KEY_STOP, REDIS_KEY_STOPPED_ACK,
+    REDIS_KEY_OWNER,
+)
+
+try:
+    from core.utils import RedisClient
+except ImportError:  # outside Dispatcharr; get_redis_client() returns None
+    RedisClient = None
 
 logger = logging.getLogger(__name__)
 
+_VERSION_RE   = re.compile(r"__version__\s*=\s*['\"]([^'\"]+)['\"]")
+_TIMESTAMP_RE = re.compile(r"__timestamp__\s*=\s*['\"]([^'\"]+)['\"]")
+
+# Checks the running flag and, only if a server is up, clears any stale stop
+# acknowledgement, sets the stop flag and publishes "stop" -- atomically, so
+# a server exiting in between cannot leave a stop flag behind for the next
+# one.  KEYS: running flag, stop ack, stop flag.  ARGV: control channel.
+_REQUEST_STOP_SCRIPT = """
+if redis.call('GET', KEYS[1]) ~= '1' then
+    return 0
+end
+redis.call('DEL', KEYS[2])
+redis.call('SET', KEYS[3], '1')
+redis.call('PUBLISH', ARGV[1], 'stop')
+return 1
+"""
+
+# Deletes the running flag and endpoint keys only if the owner key still
+# holds the caller's token, so a server shutting down late cannot clear the
+# flags of one that has since taken over.  KEYS: owner, running flag, host,
+# port.  ARGV: owner token.
+_CLEAR_SERVER_FLAGS_SCRIPT = """
+if redis.call('GET', KEYS[1]) ~= ARGV[1] then
+    return 0
+end
+return redis.call('DEL', KEYS[1], KEYS[2], KEYS[3], KEYS[4])
+"""
+
+# Sets the running flag and owner key for a starting server unless a server
+# is already marked running, so two workers starting at once cannot both
+# pass the check.  KEYS: running flag, owner.  ARGV: owner token, TTL.
+_CLAIM_SERVER_SCRIPT = """
+if redis.call('GET', KEYS[1]) == '1' then
+    return 0
+end
+redis.call('SET', KEYS[1], '1', 'EX', ARGV[2])
+redis.call('SET', KEYS[2], ARGV[1], 'EX', ARGV[2])
+return 1
+"""
+
+# Heartbeat for a running server: extends the TTLs only while the owner key
+# still holds the caller's token.  Returns 0, touching nothing, if the owner
+# key is gone (force-cleaned, or expired while Redis was unreachable) or
+# holds another server's token; the caller has then been evicted.
+# KEYS: owner, running flag, host, port.  ARGV: owner token, TTL.
+_REFRESH_SERVER_FLAGS_SCRIPT = """
+if redis.call('GET', KEYS[1]) ~= ARGV[1] then
+    return 0
+end
+for i = 1, 4 do
+    redis.call('EXPIRE', KEYS[i], ARGV[2])
+end
+return 1
+"""
+
+# Publishes a starting server's endpoint under the claim taken by
+# _CLAIM_SERVER_SCRIPT: sets host and port and restarts the TTLs, but only
+# while the owner key still holds the caller's token.  One script call, so a
+# status read (one MGET) never sees the running flag without its endpoint.
+# KEYS: owner, running flag, host, port.  ARGV: owner token, TTL, host, port.
+_ANNOUNCE_SERVER_SCRIPT = """
+if redis.call('GET', KEYS[1]) ~= ARGV[1] then
+    return 0
+end
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+redis.call('EXPIRE', KEYS[2], ARGV[2])
+redis.call('SET', KEYS[3], ARGV[3], 'EX', ARGV[2])
+redis.call('SET', KEYS[4], ARGV[4], 'EX', ARGV[2])
+return 1
+"""
+
+# Replies meaning a flag key is set; see is_redis_flag()
+_FLAG_SET_VALUES = frozenset(("1", b"1"))
+
+_LABEL_ESCAPES = str.maketrans({'\\': '\\\\', '"': '\\"', '\n': '\\n'})
+
+# (version, timestamp, full_version) once resolved; see get_dispatcharr_version()
+_dispatcharr_version_cache = None
+
+# An unresolved version is retried at most this often (seconds), so a
+# missing version module is not re-imported and re-read on every scrape.
+_VERSION_RETRY_INTERVAL = 60
+_dispatcharr_version_fallback = None  # (retry_at_monotonic, result)
+
+# Seconds a scrape's Redis connection may wait on connect or a reply; see
+# get_decoded_redis_client()
+_REDIS_SOCKET_TIMEOUT = 5
+
+# Process-wide Redis client; see get_redis_client()
+_redis_client = None
+_redis_client_lock = threading.Lock()
+
+# (source client, decoded twin); see get_decoded_redis_client()
+_decoded_redis_client = None
+
 
 def escape_label(value) -> str:
     """Escape a string for use as a Prometheus label value.
 
-    Order is critical: escape backslashes first, then double-quotes, then newlines.
+    Backslashes, double-quotes and newlines are escaped in a single
+    ``str.translate`` pass, so no escape sequence can be re-escaped.
+    Values without any of them (the common case) are returned as-is.
     """
     if not value:
         return ""
-    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    value = str(value)
+    if '\\' not in value and '"' not in value and '\n' not in value:
+        return value
+    return value.translate(_LABEL_ESCAPES)
 
 
 def normalize_host(host, default: str) -> str:
@@ -31,26 +144,165 @@ def redis_decode(value, default: str = '') -> str:
 
 
 def get_redis_client():
-    """Return the shared Dispatcharr Redis client, or None on failure."""
-    try:
-        from core.utils import RedisClient
-        return RedisClient.get_client()
-    except Exception:
-        return None
+    """Return the shared Dispatcharr Redis client, or None on failure.
+
+    The client is resolved once per process and reused; a failed lookup is
+    retried on the next call.
+    """
+    global _redis_client
+    if _redis_client is None:
+        with _redis_client_lock:
+            if _redis_client is None:
+                try:
+                    _redis_client = RedisClient.get_client()
+                except Exception:
+                    return None
+    return _redis_client
+
+
+def reset_redis_client() -> None:
+    """Drop the cached Redis client so the next get_redis_client() resolves it again.
+
+    Called after a Redis command fails, in case Dispatcharr has since
+    replaced the client the cache still points at.
+    """
+    global _redis_client
+    with _redis_client_lock:
+        _redis_client = None
+
+
+def get_decoded_redis_client(redis_client):
+    """Return a client on the same server as *redis_client* that decodes replies to str.
+
+    The shared Dispatcharr client may return bytes; a decoded twin lets the
+    parser handle UTF-8 once instead of every caller checking each value.
+    The twin's pool is our own, so it also gets bounded socket timeouts
+    (unless Dispatcharr already set some): a stalled Redis then fails the
+    scrape instead of hanging it.  Falls back to *redis_client* itself if it
+    already decodes or cannot be cloned.
+
+    The twin is kept per process, so every collector (including one created
+    by a server restart) shares a single decoded pool.
+    """
+    global _decoded_redis_client
+    with _redis_client_lock:
+        cached = _decoded_redis_client
+        if cached is not None and cached[0] is redis_client:
+            return cached[1]
+        try:
+            pool = redis_client.connection_pool
+            if pool.connection_kwargs.get('decode_responses'):
+                return redis_client
+            connection_kwargs = {**pool.connection_kwargs, 'decode_responses': True}
+            for timeout_kwarg in ('socket_timeout', 'socket_connect_timeout'):
+                if connection_kwargs.get(timeout_kwarg) is None:
+                    connection_kwargs[timeout_kwarg] = _REDIS_SOCKET_TIMEOUT
+            decoded_pool = pool.__class__(
+                connection_class=pool.connection_class,
+                max_connections=pool.max_connections,
+                **connection_kwargs,
+            )
+            decoded = redis_client.__class__(connection_pool=decoded_pool)
+        except Exception:
+            return redis_client
+        _decoded_redis_client = (redis_client, decoded)
+        return decoded
+
+
+def is_redis_flag(value) -> bool:
+    """Return True if a raw Redis reply is the flag value '1' (bytes or str)."""
+    return value in _FLAG_SET_VALUES
 
 
 def read_redis_flag(redis_client, key: str) -> bool:
     """Return True if the given Redis key holds the value '1'."""
     try:
-        val = redis_client.get(key) if redis_client else None
-        return val in (b"1", "1")
+        return is_redis_flag(redis_client.get(key) if redis_client else None)
     except Exception:
         return False
 
 
+def request_server_stop(redis_client) -> bool:
+    """Ask the metrics server running in any worker to shut down.
+
+    Returns False, without touching anything, if no server is marked
+    running.  Otherwise any stale stop acknowledgement is cleared, the stop
+    flag is set so a server that misses the message still sees it, and
+    "stop" is published on the control channel for an immediate wake-up.
+    The whole exchange is one server-side script call.
+    """
+    request_stop = redis_client.register_script(_REQUEST_STOP_SCRIPT)
+    result = request_stop(
+        keys=[REDIS_KEY_RUNNING, REDIS_KEY_STOPPED_ACK, REDIS_KEY_STOP],
+        args=[REDIS_CHANNEL_CONTROL],
+    )
+    return bool(result)
+
+
+def claim_server_flags(redis_client, owner_token: str, ttl: int) -> bool:
+    """Mark a server as running under *owner_token*, unless one already is.
+
+    Returns False, without touching anything, if the running flag is set.
+    The check and the write are one server-side script call.
+    """
+    claim = redis_client.register_script(_CLAIM_SERVER_SCRIPT)
+    return bool(claim(keys=[REDIS_KEY_RUNNING, REDIS_KEY_OWNER], args=[owner_token, ttl]))
+
+
+def announce_server_flags(redis_client, owner_token: str, host: str, port: int, ttl: int) -> bool:
+    """Record host and port for the server whose claim *owner_token* holds.
+
+    Returns False, without touching anything, if the claim has been lost.
+    """
+    announce = redis_client.register_script(_ANNOUNCE_SERVER_SCRIPT)
+    return bool(announce(
+        keys=[REDIS_KEY_OWNER, REDIS_KEY_RUNNING, REDIS_KEY_HOST, REDIS_KEY_PORT],
+        args=[owner_token, ttl, host, str(port)],
+    ))
+
+
+def clear_server_flags(redis_client, owner_token: str, pipe=None) -> None:
+    """Clear the running flag and endpoint keys if *owner_token* still owns them.
+
+    Queued on *pipe* when given, so the caller can batch it with its other
+    cleanup; otherwise sent straight away.
+    """
+    clear_flags = redis_client.register_script(_CLEAR_SERVER_FLAGS_SCRIPT)
+    clear_flags(
+        keys=[REDIS_KEY_OWNER, REDIS_KEY_RUNNING, REDIS_KEY_HOST, REDIS_KEY_PORT],
+        args=[owner_token],
+        client=pipe,
+    )
+
+
+def refresh_server_flags(redis_client, owner_token: str, ttl: int, pipe=None):
+    """Extend the running flag and endpoint keys if *owner_token* still owns them.
+
+    The reply is 1, or 0 if the flags are gone or belong to another server.
+    Flags are never re-created.  Queued on *pipe* when given, so the
+    heartbeat can batch it with its stop-flag read.
+    """
+    refresh = redis_client.register_script(_REFRESH_SERVER_FLAGS_SCRIPT)
+    return refresh(
+        keys=[REDIS_KEY_OWNER, REDIS_KEY_RUNNING, REDIS_KEY_HOST, REDIS_KEY_PORT],
+        args=[owner_token, ttl],
+        client=pipe,
+    )
+
+
 def get_dispatcharr_version():
-    """Return ``(version, timestamp, full_version)`` for the running Dispatcharr instance."""
-    import sys
+    """Return ``(version, timestamp, full_version)`` for the running Dispatcharr instance.
+
+    The version only changes when the container is redeployed, so the first
+    successful lookup is cached for the lifetime of the process.  A failed
+    lookup is reused for ``_VERSION_RETRY_INTERVAL`` seconds before retrying.
+    """
+    global _dispatcharr_version_cache, _dispatcharr_version_fallback
+    if _dispatcharr_version_cache is not None:
+        return _dispatcharr_version_cache
+    fallback = _dispatcharr_version_fallback
+    if fallback is not None and time.monotonic() < fallback[0]:
+        return fallback[1]
 
     dispatcharr_version = "unknown"
     dispatcharr_timestamp = None
@@ -65,10 +317,10 @@ def get_dispatcharr_version():
         try:
             with open('/app/version.py', 'r') as f:
                 content = f.read()
-            m = re.search(r"__version__\s*=\s*['\"]([^'\"]+)['\"]", content)
+            m = _VERSION_RE.search(content)
             if m:
                 dispatcharr_version = m.group(1)
-            m = re.search(r"__timestamp__\s*=\s*['\"]([^'\"]+)['\"]", content)
+            m = _TIMESTAMP_RE.search(content)
             if m:
                 dispatcharr_timestamp = m.group(1)
         except Exception:
@@ -78,7 +330,12 @@ def get_dispatcharr_version():
     if dispatcharr_timestamp:
         full_version = f"v{dispatcharr_version}-{dispatcharr_timestamp}"
 
-    return dispatcharr_version, dispatcharr_timestamp, full_version
+    result = (dispatcharr_version, dispatcharr_timestamp, full_version)
+    if dispatcharr_version != "unknown":
+        _dispatcharr_version_cache = result
+    else:
+        _dispatcharr_version_fallback = (time.monotonic() + _VERSION_RETRY_INTERVAL, result)
+    return result
 
 
 def compare_versions(current: str, minimum: str) -> bool:
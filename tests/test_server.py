@@ -0,0 +1,118 @@
+"""Tests for the metrics server's Redis control channel listener.
+
+Run from the repository root with ``python -m unittest discover tests``.
+The plugin modules are loaded as a package without executing
+``src/__init__.py``, so neither Dispatcharr nor Django is needed.
+"""
+
+import importlib
+import os
+import sys
+import threading
+import types
+import unittest
+from unittest import mock
+
+_SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+if "dispatcharr_exporter" not in sys.modules:
+    _package = types.ModuleType("dispatcharr_exporter")
+    _package.__path__ = [_SRC_DIR]
+    sys.modules["dispatcharr_exporter"] = _package
+
+server = importlib.import_module("dispatcharr_exporter.server")
+config = importlib.import_module("dispatcharr_exporter.config")
+
+
+class FakePubSub:
+    """Pub/sub connection that replays scripted get_message() results."""
+
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.subscribed = []
+        self.closed = False
+
+    def subscribe(self, channel):
+        self.subscribed.append(channel)
+
+    def get_message(self, timeout=None):
+        if not self.replies:
+            return None
+        reply = self.replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+    def close(self):
+        self.closed = True
+
+
+class FakeRedis:
+    """Redis client handing out the given pub/sub connections in order."""
+
+    def __init__(self, *pubsubs, stop_flag=None):
+        self.pubsubs = list(pubsubs)
+        self.stop_flag = stop_flag
+
+    def pubsub(self, ignore_subscribe_messages=False):
+        return self.pubsubs.pop(0)
+
+    def get(self, key):
+        return self.stop_flag if key == config.REDIS_KEY_STOP else None
+
+
+class ListenForStopTests(unittest.TestCase):
+
+    def setUp(self):
+        self.server = server.MetricsServer(None, port=0, host="127.0.0.1")
+        self.server._stop_event = threading.Event()
+        self.server._running.set()
+        patcher = mock.patch.object(server, "_CONTROL_RETRY_DELAY", 0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(server, "get_redis_client", return_value=None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def listen(self, redis_client):
+        thread = threading.Thread(target=self.server._listen_for_stop, args=(redis_client,), daemon=True)
+        thread.start()
+        thread.join(timeout=5)
+        self.assertFalse(thread.is_alive(), "listener did not exit")
+
+    def test_stop_message_sets_stop_event(self):
+        pubsub = FakePubSub([None, {"data": b"stop"}])
+        self.listen(FakeRedis(pubsub))
+        self.assertTrue(self.server._stop_event.is_set())
+        self.assertEqual(pubsub.subscribed, [config.REDIS_CHANNEL_CONTROL])
+        self.assertTrue(pubsub.closed)
+
+    def test_resubscribes_after_connection_drops(self):
+        dropped = FakePubSub([ConnectionError("connection reset by peer")])
+        resubscribed = FakePubSub([{"data": "stop"}])
+        self.listen(FakeRedis(dropped, resubscribed))
+        self.assertTrue(self.server._stop_event.is_set())
+        self.assertTrue(dropped.closed)
+        self.assertEqual(resubscribed.subscribed, [config.REDIS_CHANNEL_CONTROL])
+
+    def test_stop_flag_set_while_unsubscribed_is_seen_on_resubscribe(self):
+        dropped = FakePubSub([ConnectionError("connection reset by peer")])
+        resubscribed = FakePubSub([])
+        redis_client = FakeRedis(dropped, resubscribed)
+
+        def drop_and_flag(timeout=None):
+            redis_client.stop_flag = "1"
+            raise ConnectionError("connection reset by peer")
+
+        dropped.get_message = drop_and_flag
+        self.listen(redis_client)
+        self.assertTrue(self.server._stop_event.is_set())
+
+    def test_exits_when_server_stops(self):
+        self.server._running.clear()
+        self.listen(FakeRedis())
+        self.assertFalse(self.server._stop_event.is_set())
+
+
+if __name__ == "__main__":
+    unittest.main()